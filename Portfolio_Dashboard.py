@@ -8,13 +8,17 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, date, timedelta
+import logging
 import os
 import sys
 
 # Add src to path
 sys.path.insert(0, os.path.dirname(__file__))
 
-from src.database import get_session, init_db, get_all_investments, get_all_entities
+# Route module loggers (e.g. market data fetch errors) to stderr
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+
+from src.database import get_session, ensure_initialized, get_all_investments, get_all_entities
 from src.portfolio import get_portfolio_overview, update_market_prices, get_recent_activity
 from src.market_data import get_usd_cad_rate, get_fx_rate, get_stock_price
 from src.calculations import format_currency, format_percentage
@@ -28,7 +32,7 @@ st.set_page_config(
 )
 
 # Initialize database
-init_db()
+ensure_initialized()
 
 # Dark theme color palette
 COLORS = {
@@ -5,15 +5,205 @@ Provides recommendations, rebalancing suggestions, risk analysis, and market com
 
 import os
 import json
+import hashlib
+from collections import Counter, defaultdict
 from datetime import datetime, date
 from typing import Dict, List, Optional
-import yaml
 
 try:
-    from anthropic import Anthropic
-    ANTHROPIC_AVAILABLE = True
+    import orjson
+    import xxhash
+    FAST_HASH_AVAILABLE = True
 except ImportError:
-    ANTHROPIC_AVAILABLE = False
+    FAST_HASH_AVAILABLE = False
+
+# Formatted prompt sections kept per advisor, keyed by input fingerprint
+_FORMAT_CACHE_SIZE = 64
+
+
+# User prompt templates, rendered with str.format_map. Missing keys render as 'N/A'.
+_PORTFOLIO_ANALYSIS_TMPL = """Analyze this investment portfolio and provide recommendations:
+
+{portfolio_summary}
+
+Investment Policy:
+- Risk Profile: {risk_profile}
+- Investment Horizon: {investment_horizon}
+- Tax Jurisdiction: {tax_jurisdiction}
+- Consider Capital Gains Deferral: {consider_capital_gains_deferral}
+
+Please provide:
+1. Portfolio Health Assessment (2-3 sentences)
+2. Key Strengths (bullet points)
+3. Areas of Concern (bullet points)
+4. Top 3 Actionable Recommendations
+5. Tax Optimization Opportunities
+"""
+
+_REBALANCING_TMPL = """The client needs rebalancing recommendations.
+
+Current Portfolio:
+{portfolio_summary}
+
+Target Allocation:
+{target_allocation}
+
+Please provide:
+1. Priority rebalancing actions (most urgent first)
+2. Specific positions to trim or add
+3. Tax-efficient execution strategy
+4. Timeline recommendation (immediate vs. gradual)
+"""
+
+_RISK_ASSESSMENT_TMPL = """Assess the risks in this portfolio:
+
+{portfolio_summary}
+
+Concentration Analysis:
+- HHI Index: {hhi}
+- Concentrated Positions: {concentrated_positions}
+
+Liquidity Analysis:
+- Liquid Percentage: {liquid_pct}%
+- Illiquid Percentage: {illiquid_pct}%
+
+Please provide:
+1. Overall Risk Rating (Low/Medium/High/Very High)
+2. Key Risk Factors (ranked by severity)
+3. Specific Mitigation Strategies
+4. Stress Test Scenarios to Consider
+"""
+
+_MARKET_COMMENTARY_TMPL = """Provide market commentary relevant to this portfolio:
+
+Asset Classes Held:
+{holdings_by_class}
+
+Focus Areas: {focus_areas}
+
+Please provide:
+1. Current Market Environment (2-3 sentences)
+2. Asset Class Outlook for each held class
+3. Specific Considerations for Canadian Investors
+4. Key Events/Risks to Watch
+"""
+
+_SCENARIO_ANALYSIS_TMPL = """Analyze this portfolio under the following scenario:
+
+Scenario: {scenario}
+
+Current Portfolio:
+{portfolio_summary}
+
+Please provide:
+1. Estimated Portfolio Impact (percentage and dollar terms)
+2. Most Vulnerable Holdings (top 3-5)
+3. Holdings That May Benefit
+4. Recommended Defensive Actions
+5. Recovery Timeline Estimate
+"""
+
+_TARGET_ALLOCATION_TMPL = """Suggest an optimal target allocation for this portfolio:
+
+Current Portfolio:
+{portfolio_summary}
+
+Client Profile:
+- Risk Tolerance: Aggressive
+- Investment Horizon: Mixed (some current income needs, but primarily generational wealth building)
+- Tax Jurisdiction: Canada
+- Liquidity Needs: Moderate (15-20% liquid recommended)
+
+Please provide:
+1. Recommended Target Allocation (by asset class, percentages)
+2. Rationale for Each Allocation
+3. Comparison to Current Allocation
+4. Implementation Priority (what to change first)
+5. Expected Risk/Return Profile
+"""
+
+_IPS_TMPL = """Draft an Investment Policy Statement for this family office:
+
+Current Portfolio Size: C${total_value_cad}
+
+Preferences:
+- Risk Profile: {risk_profile}
+- Investment Horizon: {horizon}
+- Tax Jurisdiction: {tax_jurisdiction}
+- Liquidity Requirements: {liquidity}
+- ESG Considerations: {esg}
+- Restricted Investments: {restrictions}
+
+Current Holdings Summary:
+{portfolio_summary}
+
+Please draft a complete IPS including:
+1. Investment Objectives
+2. Risk Tolerance Statement
+3. Asset Allocation Guidelines
+4. Rebalancing Policy
+5. Performance Benchmarks
+6. Investment Restrictions
+7. Tax Considerations
+8. Review and Amendment Process
+"""
+
+_RISK_REGISTER_TMPL = """Analyze this risk register for a family office:
+
+{risks_text}
+
+Portfolio Context:
+{portfolio_summary}
+
+Please provide:
+1. Overall Risk Posture Assessment (2-3 sentences)
+2. Top 3 Priority Risks Requiring Immediate Attention
+3. Gaps in Risk Coverage (what risks are missing?)
+4. Risk Correlations (which risks could compound each other?)
+5. Recommendations for Risk Reduction
+6. Suggested Review Schedule Adjustments
+"""
+
+_MITIGATION_TMPL = """Suggest mitigation strategies for this risk:
+
+Risk: {title}
+Category: {category}
+Description: {description}
+Likelihood: {likelihood} (0=Not at all, 5=Almost certain)
+Impact: {impact} (0=No impact, 5=Extreme)
+Risk Score: {risk_score}
+Current Status: {status}
+Current Mitigation Plan: {mitigation_plan}
+Current Mitigation Actions: {mitigation_actions}
+
+Please provide:
+1. Recommended Mitigation Strategies (3-5 specific actions)
+2. Preventive Controls (to reduce likelihood)
+3. Detective Controls (to identify early)
+4. Response Plan (if the risk materializes)
+5. Estimated Residual Risk After Mitigation
+6. Suggested Review Frequency
+"""
+
+
+def _fingerprint(data) -> int:
+    """Fast 64-bit fingerprint of a portfolio/risk structure, used as a cache key."""
+    if FAST_HASH_AVAILABLE:
+        payload = orjson.dumps(data, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str)
+        return xxhash.xxh3_64_intdigest(payload)
+
+    payload = json.dumps(data, sort_keys=True, default=str).encode()
+    return int.from_bytes(hashlib.blake2b(payload, digest_size=8).digest(), 'big')
+
+
+def _render(template: str, **params) -> str:
+    """Fill a prompt template, rendering any missing field as 'N/A'."""
+    return template.format_map(defaultdict(lambda: 'N/A', params))
+
+
+def _format_pct(value) -> str:
+    """Format a percentage to one decimal, passing non-numeric values through."""
+    return f"{value:.1f}" if isinstance(value, (int, float)) else str(value)
 
 
 class AIAdvisor:
@@ -22,15 +212,23 @@ class AIAdvisor:
     def __init__(self, config_path: str = None):
         self.api_key = os.environ.get('ANTHROPIC_API_KEY')
         self.client = None
+        self._format_cache = {}
 
-        if ANTHROPIC_AVAILABLE and self.api_key:
-            self.client = Anthropic(api_key=self.api_key)
+        # anthropic and yaml are imported here rather than at module level so
+        # pages that never build an advisor don't pay for them on every rerun
+        if self.api_key:
+            try:
+                from anthropic import Anthropic
+                self.client = Anthropic(api_key=self.api_key, http_client=self._build_http_client())
+            except ImportError:
+                pass
 
         # Load config
         if config_path is None:
             config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config.yaml')
 
         try:
+            import yaml
             with open(config_path, 'r') as f:
                 self.config = yaml.safe_load(f)
         except:
@@ -38,6 +236,26 @@ class AIAdvisor:
 
         self.investment_policy = self.config.get('investment_policy', {})
 
+    @staticmethod
+    def _build_http_client():
+        """
+        Build a keep-alive HTTP client for the Anthropic SDK so back-to-back
+        calls reuse one connection. HTTP/2 is enabled when h2 is installed.
+        """
+        import httpx
+
+        try:
+            import h2  # noqa: F401
+            http2 = True
+        except ImportError:
+            http2 = False
+
+        return httpx.Client(
+            http2=http2,
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+            timeout=60.0,
+        )
+
     def is_available(self) -> bool:
         """Check if AI advisor is available (API key set)."""
         return self.client is not None
@@ -65,6 +283,9 @@ class AIAdvisor:
         """
         Get comprehensive portfolio analysis and recommendations.
         """
+        return self._portfolio_analysis(self._format_portfolio_for_ai(portfolio_data))
+
+    def _portfolio_analysis(self, portfolio_summary: str) -> Optional[str]:
         system_prompt = """You are an expert investment advisor for a Canadian single family office.
 You provide thoughtful, actionable advice considering:
 - The client's aggressive risk profile
@@ -75,25 +296,14 @@ You provide thoughtful, actionable advice considering:
 Provide clear, structured analysis with specific recommendations.
 Use Canadian dollar figures. Be direct and professional."""
 
-        portfolio_summary = self._format_portfolio_for_ai(portfolio_data)
-
-        user_prompt = f"""Analyze this investment portfolio and provide recommendations:
-
-{portfolio_summary}
-
-Investment Policy:
-- Risk Profile: {self.investment_policy.get('risk_profile', 'aggressive')}
-- Investment Horizon: {self.investment_policy.get('investment_horizon', 'mixed')}
-- Tax Jurisdiction: {self.investment_policy.get('tax_jurisdiction', 'Canada')}
-- Consider Capital Gains Deferral: {self.investment_policy.get('consider_capital_gains_deferral', True)}
-
-Please provide:
-1. Portfolio Health Assessment (2-3 sentences)
-2. Key Strengths (bullet points)
-3. Areas of Concern (bullet points)
-4. Top 3 Actionable Recommendations
-5. Tax Optimization Opportunities
-"""
+        user_prompt = _render(
+            _PORTFOLIO_ANALYSIS_TMPL,
+            portfolio_summary=portfolio_summary,
+            risk_profile=self.investment_policy.get('risk_profile', 'aggressive'),
+            investment_horizon=self.investment_policy.get('investment_horizon', 'mixed'),
+            tax_jurisdiction=self.investment_policy.get('tax_jurisdiction', 'Canada'),
+            consider_capital_gains_deferral=self.investment_policy.get('consider_capital_gains_deferral', True),
+        )
 
         return self._call_claude(system_prompt, user_prompt)
 
@@ -106,22 +316,12 @@ Consider transaction costs, tax implications, and market timing when making reco
 Be specific about which positions to adjust and by how much."""
 
         portfolio_summary = self._format_portfolio_for_ai(portfolio_data)
-        target_str = json.dumps(target_allocation, indent=2)
-
-        user_prompt = f"""The client needs rebalancing recommendations.
-
-Current Portfolio:
-{portfolio_summary}
-
-Target Allocation:
-{target_str}
 
-Please provide:
-1. Priority rebalancing actions (most urgent first)
-2. Specific positions to trim or add
-3. Tax-efficient execution strategy
-4. Timeline recommendation (immediate vs. gradual)
-"""
+        user_prompt = _render(
+            _REBALANCING_TMPL,
+            portfolio_summary=portfolio_summary,
+            target_allocation=json.dumps(target_allocation, indent=2),
+        )
 
         return self._call_claude(system_prompt, user_prompt)
 
@@ -129,32 +329,24 @@ Please provide:
         """
         Get detailed risk assessment.
         """
+        return self._risk_assessment(self._format_portfolio_for_ai(portfolio_data), portfolio_data)
+
+    def _risk_assessment(self, portfolio_summary: str, portfolio_data: Dict) -> Optional[str]:
         system_prompt = """You are a risk management expert for investment portfolios.
 Identify and quantify risks clearly. Provide specific mitigation strategies.
 Consider concentration risk, liquidity risk, market risk, and currency risk."""
 
-        portfolio_summary = self._format_portfolio_for_ai(portfolio_data)
         concentration = portfolio_data.get('risk', {}).get('concentration', {})
         liquidity = portfolio_data.get('risk', {}).get('liquidity', {})
 
-        user_prompt = f"""Assess the risks in this portfolio:
-
-{portfolio_summary}
-
-Concentration Analysis:
-- HHI Index: {concentration.get('hhi', 'N/A')}
-- Concentrated Positions: {json.dumps(concentration.get('concentrated_positions', []))}
-
-Liquidity Analysis:
-- Liquid Percentage: {liquidity.get('liquid_pct', 'N/A'):.1f}%
-- Illiquid Percentage: {liquidity.get('illiquid_pct', 'N/A'):.1f}%
-
-Please provide:
-1. Overall Risk Rating (Low/Medium/High/Very High)
-2. Key Risk Factors (ranked by severity)
-3. Specific Mitigation Strategies
-4. Stress Test Scenarios to Consider
-"""
+        user_prompt = _render(
+            _RISK_ASSESSMENT_TMPL,
+            portfolio_summary=portfolio_summary,
+            hhi=concentration.get('hhi', 'N/A'),
+            concentrated_positions=json.dumps(concentration.get('concentrated_positions', [])),
+            liquid_pct=_format_pct(liquidity.get('liquid_pct', 'N/A')),
+            illiquid_pct=_format_pct(liquidity.get('illiquid_pct', 'N/A')),
+        )
 
         return self._call_claude(system_prompt, user_prompt)
 
@@ -169,26 +361,15 @@ Please provide:
 Focus on actionable insights relevant to the specific asset classes held.
 Consider both Canadian and US markets. Be concise but insightful."""
 
-        holdings_by_class = {}
+        holdings_by_class = defaultdict(list)
         for h in portfolio_data.get('holdings', []):
-            ac = h.get('asset_class', 'Other')
-            if ac not in holdings_by_class:
-                holdings_by_class[ac] = []
-            holdings_by_class[ac].append(h.get('name', 'Unknown'))
+            holdings_by_class[h.get('asset_class', 'Other')].append(h.get('name', 'Unknown'))
 
-        user_prompt = f"""Provide market commentary relevant to this portfolio:
-
-Asset Classes Held:
-{json.dumps(holdings_by_class, indent=2)}
-
-Focus Areas: {', '.join(focus_areas)}
-
-Please provide:
-1. Current Market Environment (2-3 sentences)
-2. Asset Class Outlook for each held class
-3. Specific Considerations for Canadian Investors
-4. Key Events/Risks to Watch
-"""
+        user_prompt = _render(
+            _MARKET_COMMENTARY_TMPL,
+            holdings_by_class=json.dumps(holdings_by_class, indent=2),
+            focus_areas=', '.join(focus_areas),
+        )
 
         return self._call_claude(system_prompt, user_prompt)
 
@@ -198,12 +379,13 @@ Please provide:
 
         Scenarios: 'market_crash', 'recession', 'inflation', 'rate_hike', 'cad_depreciation'
         """
+        return self._scenario_analysis(self._format_portfolio_for_ai(portfolio_data), scenario)
+
+    def _scenario_analysis(self, portfolio_summary: str, scenario: str) -> Optional[str]:
         system_prompt = """You are a portfolio stress testing expert.
 Provide realistic estimates of portfolio impact under various scenarios.
 Be specific about which holdings would be most affected and why."""
 
-        portfolio_summary = self._format_portfolio_for_ai(portfolio_data)
-
         scenario_descriptions = {
             'market_crash': 'A 30% decline in global equity markets over 3 months',
             'recession': 'A Canadian recession with GDP declining 2% over 12 months',
@@ -216,20 +398,11 @@ Be specific about which holdings would be most affected and why."""
 
         scenario_desc = scenario_descriptions.get(scenario, scenario)
 
-        user_prompt = f"""Analyze this portfolio under the following scenario:
-
-Scenario: {scenario_desc}
-
-Current Portfolio:
-{portfolio_summary}
-
-Please provide:
-1. Estimated Portfolio Impact (percentage and dollar terms)
-2. Most Vulnerable Holdings (top 3-5)
-3. Holdings That May Benefit
-4. Recommended Defensive Actions
-5. Recovery Timeline Estimate
-"""
+        user_prompt = _render(
+            _SCENARIO_ANALYSIS_TMPL,
+            scenario=scenario_desc,
+            portfolio_summary=portfolio_summary,
+        )
 
         return self._call_claude(system_prompt, user_prompt)
 
@@ -237,32 +410,36 @@ Please provide:
         """
         AI-suggested target allocation based on risk profile and current holdings.
         """
+        return self._target_allocation(self._format_portfolio_for_ai(portfolio_data))
+
+    def _target_allocation(self, portfolio_summary: str) -> Optional[str]:
         system_prompt = """You are an asset allocation strategist for high-net-worth Canadian clients.
 Design allocations that balance growth with appropriate risk management.
 Consider the client's aggressive profile but also their need for some liquidity."""
 
-        portfolio_summary = self._format_portfolio_for_ai(portfolio_data)
+        user_prompt = _render(_TARGET_ALLOCATION_TMPL, portfolio_summary=portfolio_summary)
 
-        user_prompt = f"""Suggest an optimal target allocation for this portfolio:
+        return self._call_claude(system_prompt, user_prompt)
 
-Current Portfolio:
-{portfolio_summary}
+    def run_full_report(self, portfolio_data: Dict, scenarios: List[str] = None) -> Dict[str, Optional[str]]:
+        """
+        Run the standard set of analyses against one portfolio.
 
-Client Profile:
-- Risk Tolerance: Aggressive
-- Investment Horizon: Mixed (some current income needs, but primarily generational wealth building)
-- Tax Jurisdiction: Canada
-- Liquidity Needs: Moderate (15-20% liquid recommended)
+        The portfolio is formatted once and shared by every section. Each
+        scenario in `scenarios` adds a 'scenario_<name>' entry.
+        """
+        portfolio_summary = self._format_portfolio_for_ai(portfolio_data)
 
-Please provide:
-1. Recommended Target Allocation (by asset class, percentages)
-2. Rationale for Each Allocation
-3. Comparison to Current Allocation
-4. Implementation Priority (what to change first)
-5. Expected Risk/Return Profile
-"""
+        report = {
+            'portfolio_analysis': self._portfolio_analysis(portfolio_summary),
+            'risk_assessment': self._risk_assessment(portfolio_summary, portfolio_data),
+            'target_allocation': self._target_allocation(portfolio_summary),
+            'market_commentary': self.get_market_commentary(portfolio_data),
+        }
+        for scenario in scenarios or []:
+            report[f'scenario_{scenario}'] = self._scenario_analysis(portfolio_summary, scenario)
 
-        return self._call_claude(system_prompt, user_prompt)
+        return report
 
     def draft_investment_policy_statement(self, portfolio_data: Dict, preferences: Dict = None) -> Optional[str]:
         """
@@ -275,33 +452,19 @@ Please provide:
 Create a professional, comprehensive document that can guide investment decisions.
 Use clear, actionable language suitable for a family office."""
 
-        portfolio_summary = self._format_portfolio_for_ai(portfolio_data)
-
-        user_prompt = f"""Draft an Investment Policy Statement for this family office:
-
-Current Portfolio Size: C${portfolio_data.get('summary', {}).get('total_value_cad', 0):,.0f}
-
-Preferences:
-- Risk Profile: {preferences.get('risk_profile', 'Aggressive')}
-- Investment Horizon: {preferences.get('horizon', 'Mixed - current income and generational wealth')}
-- Tax Jurisdiction: {preferences.get('tax_jurisdiction', 'Canada')}
-- Liquidity Requirements: {preferences.get('liquidity', 'Moderate')}
-- ESG Considerations: {preferences.get('esg', 'None specified')}
-- Restricted Investments: {preferences.get('restrictions', 'None specified')}
+        portfolio_summary = self._format_portfolio_for_ai(portfolio_data, verbosity=25)
 
-Current Holdings Summary:
-{portfolio_summary}
-
-Please draft a complete IPS including:
-1. Investment Objectives
-2. Risk Tolerance Statement
-3. Asset Allocation Guidelines
-4. Rebalancing Policy
-5. Performance Benchmarks
-6. Investment Restrictions
-7. Tax Considerations
-8. Review and Amendment Process
-"""
+        user_prompt = _render(
+            _IPS_TMPL,
+            total_value_cad=f"{portfolio_data.get('summary', {}).get('total_value_cad', 0):,.0f}",
+            risk_profile=preferences.get('risk_profile', 'Aggressive'),
+            horizon=preferences.get('horizon', 'Mixed - current income and generational wealth'),
+            tax_jurisdiction=preferences.get('tax_jurisdiction', 'Canada'),
+            liquidity=preferences.get('liquidity', 'Moderate'),
+            esg=preferences.get('esg', 'None specified'),
+            restrictions=preferences.get('restrictions', 'None specified'),
+            portfolio_summary=portfolio_summary,
+        )
 
         return self._call_claude(system_prompt, user_prompt, max_tokens=4000)
 
@@ -319,21 +482,11 @@ Be specific, structured, and professional. Use markdown formatting."""
         risks_text = self._format_risks_for_ai(risks_data)
         portfolio_summary = self._format_portfolio_for_ai(portfolio_data)
 
-        user_prompt = f"""Analyze this risk register for a family office:
-
-{risks_text}
-
-Portfolio Context:
-{portfolio_summary}
-
-Please provide:
-1. Overall Risk Posture Assessment (2-3 sentences)
-2. Top 3 Priority Risks Requiring Immediate Attention
-3. Gaps in Risk Coverage (what risks are missing?)
-4. Risk Correlations (which risks could compound each other?)
-5. Recommendations for Risk Reduction
-6. Suggested Review Schedule Adjustments
-"""
+        user_prompt = _render(
+            _RISK_REGISTER_TMPL,
+            risks_text=risks_text,
+            portfolio_summary=portfolio_summary,
+        )
 
         return self._call_claude(system_prompt, user_prompt, max_tokens=3000)
 
@@ -344,37 +497,41 @@ Provide specific, actionable mitigation strategies that are practical to impleme
 Consider insurance, legal structures, operational controls, and contingency planning.
 Use markdown formatting."""
 
-        user_prompt = f"""Suggest mitigation strategies for this risk:
-
-Risk: {risk_data.get('title', 'Unknown')}
-Category: {risk_data.get('category', 'Unknown')}
-Description: {risk_data.get('description', 'No description')}
-Likelihood: {risk_data.get('likelihood', 0)} (0=Not at all, 5=Almost certain)
-Impact: {risk_data.get('impact', 0)} (0=No impact, 5=Extreme)
-Risk Score: {risk_data.get('risk_score', 0)}
-Current Status: {risk_data.get('status', 'Identified')}
-Current Mitigation Plan: {risk_data.get('mitigation_plan', 'None')}
-Current Mitigation Actions: {risk_data.get('mitigation_actions', 'None')}
-
-Please provide:
-1. Recommended Mitigation Strategies (3-5 specific actions)
-2. Preventive Controls (to reduce likelihood)
-3. Detective Controls (to identify early)
-4. Response Plan (if the risk materializes)
-5. Estimated Residual Risk After Mitigation
-6. Suggested Review Frequency
-"""
+        user_prompt = _render(
+            _MITIGATION_TMPL,
+            title=risk_data.get('title', 'Unknown'),
+            category=risk_data.get('category', 'Unknown'),
+            description=risk_data.get('description', 'No description'),
+            likelihood=risk_data.get('likelihood', 0),
+            impact=risk_data.get('impact', 0),
+            risk_score=risk_data.get('risk_score', 0),
+            status=risk_data.get('status', 'Identified'),
+            mitigation_plan=risk_data.get('mitigation_plan', 'None'),
+            mitigation_actions=risk_data.get('mitigation_actions', 'None'),
+        )
 
         return self._call_claude(system_prompt, user_prompt, max_tokens=2000)
 
+    def _cached_format(self, key, build):
+        """Return the cached formatted text for key, building it on a miss."""
+        text = self._format_cache.get(key)
+        if text is None:
+            if len(self._format_cache) >= _FORMAT_CACHE_SIZE:
+                self._format_cache.clear()
+            text = self._format_cache[key] = build()
+        return text
+
     def _format_risks_for_ai(self, risks_data: List[Dict]) -> str:
         """Format risk data for AI consumption."""
+        return self._cached_format(
+            ('risks', _fingerprint(risks_data)),
+            lambda: self._build_risks_text(risks_data),
+        )
+
+    def _build_risks_text(self, risks_data: List[Dict]) -> str:
         lines = [f"Total Risks: {len(risks_data)}", ""]
 
-        categories = {}
-        for r in risks_data:
-            cat = r.get('category', 'Unknown')
-            categories[cat] = categories.get(cat, 0) + 1
+        categories = Counter(r.get('category', 'Unknown') for r in risks_data)
 
         lines.append("By Category:")
         for cat, count in sorted(categories.items()):
@@ -395,12 +552,22 @@ Please provide:
 
         return "\n".join(lines)
 
-    def _format_portfolio_for_ai(self, portfolio_data: Dict) -> str:
-        """Format portfolio data for AI consumption."""
-        summary = portfolio_data.get('summary', {})
-        by_asset_class = portfolio_data.get('by_asset_class', {})
-        by_entity = portfolio_data.get('by_entity', {})
-        holdings = portfolio_data.get('holdings', [])
+    def _format_portfolio_for_ai(self, portfolio_data: Dict, verbosity: int = 10) -> str:
+        """
+        Format portfolio data for AI consumption.
+
+        verbosity is the number of top holdings listed. Asset classes and
+        entities are capped too, with the tail rolled up into one line, to keep
+        prompt size bounded for large portfolios.
+        """
+        return self._cached_format(
+            ('portfolio', _fingerprint(portfolio_data), verbosity),
+            lambda: self._build_portfolio_text(portfolio_data, verbosity),
+        )
+
+    def _build_portfolio_text(self, portfolio_data: Dict, verbosity: int) -> str:
+        prepared = self._prepare_portfolio(portfolio_data)
+        summary = prepared['summary']
 
         lines = [
             f"Total Portfolio Value: C${summary.get('total_value_cad', 0):,.2f}",
@@ -411,23 +578,47 @@ Please provide:
             "Allocation by Asset Class:",
         ]
 
-        for ac, data in sorted(by_asset_class.items(), key=lambda x: x[1]['value'], reverse=True):
-            lines.append(f"  - {ac}: C${data['value']:,.0f} ({data['weight']:.1f}%)")
+        self._append_allocation_lines(lines, prepared['sorted_asset_classes'], max(15, verbosity), 'classes')
 
         lines.append("")
         lines.append("Allocation by Entity:")
-        for entity, data in by_entity.items():
-            lines.append(f"  - {entity}: C${data['value']:,.0f} ({data['weight']:.1f}%)")
+        self._append_allocation_lines(lines, prepared['sorted_entities'], max(10, verbosity), 'entities')
 
         lines.append("")
-        lines.append("Top 10 Holdings:")
-        sorted_holdings = sorted(holdings, key=lambda x: x['current_value'], reverse=True)[:10]
-        for h in sorted_holdings:
+        lines.append(f"Top {verbosity} Holdings:")
+        for h in prepared['sorted_holdings'][:verbosity]:
             gain_str = f"+{h['unrealized_gain_pct']:.1f}%" if h['unrealized_gain_pct'] >= 0 else f"{h['unrealized_gain_pct']:.1f}%"
             lines.append(f"  - {h['name']} ({h['asset_class']}): C${h['current_value']:,.0f} ({h['weight']:.1f}%) [{gain_str}]")
 
         return "\n".join(lines)
 
+    @staticmethod
+    def _prepare_portfolio(portfolio_data: Dict) -> Dict:
+        """
+        Sort the portfolio's allocations and holdings.
+
+        Only called on a _cached_format miss, so each distinct portfolio
+        (by fingerprint) is sorted once; the caller's dict is left untouched.
+        """
+        by_value = lambda x: x[1]['value']
+        return {
+            'summary': portfolio_data.get('summary', {}),
+            'sorted_asset_classes': sorted(portfolio_data.get('by_asset_class', {}).items(), key=by_value, reverse=True),
+            'sorted_entities': sorted(portfolio_data.get('by_entity', {}).items(), key=by_value, reverse=True),
+            'sorted_holdings': sorted(portfolio_data.get('holdings', []), key=lambda x: x['current_value'], reverse=True),
+        }
+
+    @staticmethod
+    def _append_allocation_lines(lines: List[str], items: List, limit: int, label: str):
+        """Append up to `limit` allocation rows, rolling the rest into one line."""
+        for name, data in items[:limit]:
+            lines.append(f"  - {name}: C${data['value']:,.0f} ({data['weight']:.1f}%)")
+
+        rest = items[limit:]
+        if rest:
+            rest_value = sum(data['value'] for _, data in rest)
+            lines.append(f"  - ... and {len(rest)} smaller {label} totaling C${rest_value:,.0f}")
+
 
 # Singleton instance
 _advisor = None
@@ -470,6 +661,10 @@ def draft_investment_policy_statement(portfolio_data: Dict, preferences: Dict =
     return get_advisor().draft_investment_policy_statement(portfolio_data, preferences)
 
 
+def get_full_report(portfolio_data: Dict, scenarios: List[str] = None) -> Dict[str, Optional[str]]:
+    return get_advisor().run_full_report(portfolio_data, scenarios)
+
+
 def get_risk_register_analysis(risks_data: List[Dict], portfolio_data: Dict) -> Optional[str]:
     return get_advisor().get_risk_register_analysis(risks_data, portfolio_data)
 
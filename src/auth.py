@@ -4,18 +4,23 @@ Simple password-based authentication using streamlit-authenticator.
 """
 
 import streamlit as st
-import streamlit_authenticator as stauth
 import yaml
 from pathlib import Path
-import bcrypt
 import os
 
 # Config file path
 AUTH_CONFIG_PATH = Path(__file__).parent.parent / "data" / "auth_config.yaml"
 
+# Prefer the libyaml-backed dumper when PyYAML was built with it
+try:
+    from yaml import CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper
+
 
 def get_password_hash(password: str) -> str:
     """Hash a password for storage."""
+    import bcrypt
     return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
 
 
@@ -47,15 +52,25 @@ def create_default_config():
     # Ensure directory exists
     os.makedirs(os.path.dirname(AUTH_CONFIG_PATH), exist_ok=True)
 
-    with open(AUTH_CONFIG_PATH, 'w') as f:
-        yaml.dump(config, f, default_flow_style=False)
-
-    # Restrict file permissions
-    os.chmod(AUTH_CONFIG_PATH, 0o600)
+    _write_config(config)
 
     return config
 
 
+def _write_config(config):
+    """
+    Write the config to a temp file and atomically swap it into place,
+    so a crash mid-write can never leave a truncated config behind.
+    """
+    tmp_path = AUTH_CONFIG_PATH.with_suffix('.yaml.tmp')
+    with open(tmp_path, 'w') as f:
+        yaml.dump(config, f, Dumper=_YamlDumper, default_flow_style=False)
+
+    # Restrict file permissions
+    os.chmod(tmp_path, 0o600)
+    os.replace(tmp_path, AUTH_CONFIG_PATH)
+
+
 def load_config():
     """Load authentication config, creating default if needed."""
     if not AUTH_CONFIG_PATH.exists():
@@ -67,8 +82,10 @@ def load_config():
 
 def save_config(config):
     """Save authentication config."""
-    with open(AUTH_CONFIG_PATH, 'w') as f:
-        yaml.dump(config, f, default_flow_style=False)
+    _write_config(config)
+
+    # Rebuild the cached authenticator so it sees the new credentials
+    st.session_state.pop('_authenticator', None)
 
 
 def check_authentication():
@@ -76,16 +93,27 @@ def check_authentication():
     Check if user is authenticated.
     Returns True if authenticated, False otherwise.
     Also handles login UI.
+
+    Once a user has logged in, the username and authenticator are kept in
+    session state so later reruns skip the config load and hash checks.
     """
-    config = load_config()
+    authenticator = st.session_state.get('_authenticator')
+    if authenticator is not None and st.session_state.get('_authed_user'):
+        return True, st.session_state['_authed_user'], authenticator
+
+    if authenticator is None:
+        import streamlit_authenticator as stauth
+
+        config = load_config()
 
-    authenticator = stauth.Authenticate(
-        config['credentials'],
-        config['cookie']['name'],
-        config['cookie']['key'],
-        config['cookie']['expiry_days'],
-        config.get('preauthorized', {})
-    )
+        authenticator = stauth.Authenticate(
+            config['credentials'],
+            config['cookie']['name'],
+            config['cookie']['key'],
+            config['cookie']['expiry_days'],
+            config.get('preauthorized', {})
+        )
+        st.session_state['_authenticator'] = authenticator
 
     # Custom login styling
     st.markdown("""
@@ -116,6 +144,7 @@ def check_authentication():
         """, unsafe_allow_html=True)
         return False, None, authenticator
 
+    st.session_state['_authed_user'] = username
     return True, username, authenticator
 
 
@@ -124,6 +153,7 @@ def show_logout(authenticator):
     with st.sidebar:
         if st.button("Logout", use_container_width=True):
             authenticator.logout('Logout', 'sidebar')
+            st.session_state.pop('_authed_user', None)
             st.rerun()
 
 
@@ -10,6 +10,18 @@ from typing import List, Dict, Tuple, Optional
 import pandas as pd
 from scipy import optimize
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback when numba is not installed: run the function as plain Python."""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
 
 def calculate_simple_return(current_value: float, cost_basis: float) -> float:
     """
@@ -82,6 +94,120 @@ def calculate_irr(cash_flows: List[Tuple[date, float]], current_value: float, cu
         return None
 
 
+@njit(cache=True, fastmath=True)
+def _xirr_newton(days, amounts, guess=0.1):
+    """
+    Newton's method on the XIRR NPV equation.
+
+    Returns NaN if the iteration leaves the valid domain or fails to converge.
+    """
+    years = days / 365.0
+    rate = guess
+    for _ in range(50):
+        if rate <= -1.0:
+            return np.nan
+        discount = (1.0 + rate) ** -years
+        f = np.sum(amounts * discount)
+        fprime = -np.sum(amounts * years * discount) / (1.0 + rate)
+        if fprime == 0.0:
+            return np.nan
+        step = f / fprime
+        rate -= step
+        if abs(f) < 1e-9 or abs(step) < 1e-10:
+            return rate
+    return np.nan
+
+
+@njit(cache=True)
+def _npv(years, amounts, rate):
+    """NPV of cash flows at `years` (fractional years from the first flow)."""
+    return np.sum(amounts * (1.0 + rate) ** -years)
+
+
+@njit(cache=True)
+def _xirr_modab(days, amounts, lo=-0.9999, hi=10.0, tol=1e-10, maxiter=200):
+    """
+    Modified Anderson-Bjorck bracketed root finder on the XIRR NPV equation.
+
+    Starts with bisection, switches to false position once the function looks
+    linear on the bracket, and down-weights the stale endpoint (Anderson-Bjorck)
+    when the same side is kept twice. Falls back to bisection whenever the
+    bracket stops halving. Returns NaN if [lo, hi] doesn't bracket a root.
+    """
+    years = days / 365.0
+    x1, x2 = lo, hi
+    y1 = _npv(years, amounts, x1)
+    y2 = _npv(years, amounts, x2)
+    if y1 == 0.0:
+        return x1
+    if y2 == 0.0:
+        return x2
+    if y1 * y2 > 0.0:
+        return np.nan
+
+    side = 0
+    bisection = True
+    width = x2 - x1
+    x3 = x1
+    for i in range(maxiter):
+        if bisection:
+            x3 = 0.5 * (x1 + x2)
+            y3 = _npv(years, amounts, x3)
+            ym = 0.5 * (y1 + y2)
+            # Close enough to linear on this bracket to trust false position
+            if abs(ym - y3) < 0.25 * (abs(ym) + abs(y3)):
+                bisection = False
+        else:
+            x3 = (x1 * y2 - y1 * x2) / (y2 - y1)
+            y3 = _npv(years, amounts, x3)
+
+        if y3 == 0.0 or (x2 - x1) < tol:
+            return x3
+
+        if (y1 > 0.0) == (y3 > 0.0):
+            if side == 1:
+                m = 1.0 - y3 / y1
+                y2 = y2 * m if m > 0.0 else 0.5 * y2
+            elif not bisection:
+                side = 1
+            x1, y1 = x3, y3
+        else:
+            if side == -1:
+                m = 1.0 - y3 / y2
+                y1 = y1 * m if m > 0.0 else 0.5 * y1
+            elif not bisection:
+                side = -1
+            x2, y2 = x3, y3
+
+        # Every few steps, drop back to bisection if the bracket isn't shrinking fast enough
+        if i % 4 == 3:
+            if (x2 - x1) > 0.5 * width:
+                bisection = True
+                side = 0
+            width = x2 - x1
+
+    return x3
+
+
+# Coarse rate grid used to bracket the IRR before the bracketed solvers run.
+# Log-spaced in (1 + rate) so it is dense near -100% and sparse at high rates.
+_IRR_GRID = np.geomspace(0.1, 6.0, 16) - 1.0
+
+
+def _bracket_irr(exps: np.ndarray, amts: np.ndarray) -> Tuple[float, float]:
+    """
+    Find a narrow [lo, hi] containing an IRR by evaluating NPV on _IRR_GRID in
+    one vectorized pass. Returns the full search range if the grid shows no
+    sign change.
+    """
+    npvs = np.sum(amts[:, None] * (1.0 + _IRR_GRID[None, :]) ** (-exps[:, None]), axis=0)
+    sign_changes = np.flatnonzero(np.signbit(npvs[:-1]) != np.signbit(npvs[1:]))
+    if len(sign_changes) == 0:
+        return -0.9999, 10.0
+    i = sign_changes[0]
+    return float(_IRR_GRID[i]), float(_IRR_GRID[i + 1])
+
+
 def xirr(dates_days: List[int], amounts: List[float]) -> Optional[float]:
     """
     Calculate XIRR (Extended Internal Rate of Return).
@@ -100,27 +226,49 @@ def xirr(dates_days: List[int], amounts: List[float]) -> Optional[float]:
     if all(a >= 0 for a in amounts) or all(a <= 0 for a in amounts):
         return None
 
+    days = np.asarray(dates_days, dtype=np.float64)
+    amts = np.asarray(amounts, dtype=np.float64)
+    exps = days / 365.0
+
+    # Compiled Newton first, compiled bracketed modAB if it diverges
+    result = _xirr_newton(days, amts, 0.1)
+    if np.isfinite(result) and result > -1.0:
+        return float(result)
+
+    lo, hi = _bracket_irr(exps, amts)
+    result = _xirr_modab(days, amts, lo, hi)
+    if np.isfinite(result):
+        return float(result)
+
     def npv(rate):
         """Calculate NPV for a given rate"""
-        total = 0
-        for i, amount in enumerate(amounts):
-            days = dates_days[i]
-            total += amount / ((1 + rate) ** (days / 365.0))
-        return total
+        return np.sum(amts * np.power(1.0 + rate, -exps))
 
+    def dnpv(rate):
+        """Analytic derivative of NPV with respect to rate"""
+        return -np.sum(amts * exps * np.power(1.0 + rate, -(exps + 1.0)))
+
+    # Last resort for pathological sign patterns
     try:
         # Try to find rate where NPV = 0
-        result = optimize.brentq(npv, -0.9999, 10, maxiter=1000)
+        # IRR is reported to ~4 significant digits, so loose tolerances are plenty
+        result = optimize.brenth(npv, lo, hi, maxiter=100, xtol=1e-6, rtol=1e-6)
         return result
     except ValueError:
         # Try with different bounds
         try:
-            result = optimize.newton(npv, 0.1, maxiter=1000)
+            result = optimize.newton(npv, 0.1, fprime=dnpv, maxiter=50, tol=1e-6)
             return result
         except:
             return None
 
 
+if NUMBA_AVAILABLE:
+    # Compile the IRR kernels at import so the first user call doesn't pay for it
+    _xirr_newton(np.array([0.0, 365.0]), np.array([-1.0, 1.1]), 0.1)
+    _xirr_modab(np.array([0.0, 365.0]), np.array([-1.0, 1.1]), -0.9999, 10.0)
+
+
 def calculate_time_weighted_return(
     period_returns: List[float]
 ) -> float:
@@ -136,11 +284,8 @@ def calculate_time_weighted_return(
     if not period_returns:
         return 0.0
 
-    cumulative = 1.0
-    for r in period_returns:
-        cumulative *= (1 + r)
-
-    return (cumulative - 1) * 100
+    returns = np.asarray(period_returns, dtype=np.float64)
+    return float(np.prod(1.0 + returns) - 1.0) * 100
 
 
 def annualize_return(total_return_pct: float, years: float) -> float:
@@ -203,6 +348,15 @@ def calculate_realized_gain(
     }
 
 
+# Direction of each transaction type as a portfolio cash flow
+_CASH_FLOW_SIGN = {
+    'Buy': 1,
+    'Capital Call': 1,
+    'Sell': -1,
+    'Capital Return': -1,
+}
+
+
 def calculate_portfolio_return(
     holdings: List[Dict],
     period_start_values: Dict[str, float],
@@ -222,18 +376,26 @@ def calculate_portfolio_return(
         Dict with portfolio return metrics
     """
     total_start_value = sum(period_start_values.values())
-    total_end_value = sum(h['current_value'] for h in holdings)
+    end_values = np.fromiter((h['current_value'] for h in holdings), dtype=np.float64, count=len(holdings))
+    total_end_value = float(end_values.sum())
+
+    # Flatten transactions into parallel arrays: date, amount, flow direction
+    transactions = [tx for h in holdings for tx in h.get('transactions', [])]
+    tx_dates = np.array([tx['date'] for tx in transactions], dtype='datetime64[D]')
+    tx_amounts = np.fromiter((tx['amount'] for tx in transactions), dtype=np.float64, count=len(transactions))
+    tx_signs = np.fromiter(
+        (_CASH_FLOW_SIGN.get(tx['type'], 0) for tx in transactions), dtype=np.float64, count=len(transactions)
+    )
+
+    # Sort by date so the period bounds can be found by binary search
+    order = np.argsort(tx_dates, kind='stable')
+    tx_dates = tx_dates[order]
+    lo = np.searchsorted(tx_dates, np.datetime64(period_start_date, 'D'), side='left')
+    hi = np.searchsorted(tx_dates, np.datetime64(period_end_date, 'D'), side='right')
 
     # Calculate net cash flows during period
-    net_flows = 0
-    for h in holdings:
-        for tx in h.get('transactions', []):
-            tx_date = tx['date']
-            if period_start_date <= tx_date <= period_end_date:
-                if tx['type'] in ['Buy', 'Capital Call']:
-                    net_flows += tx['amount']
-                elif tx['type'] in ['Sell', 'Capital Return']:
-                    net_flows -= tx['amount']
+    in_period = order[lo:hi]
+    net_flows = float(np.dot(tx_signs[in_period], tx_amounts[in_period]))
 
     # Simple return
     simple_return = calculate_simple_return(total_end_value, total_start_value + net_flows)
@@ -264,36 +426,40 @@ def calculate_performance_attribution(
     Returns:
         Attribution analysis
     """
-    # Group by asset class
-    asset_class_data = {}
-    total_portfolio_return = 0
-
-    for h in holdings:
-        asset_class = h.get('asset_class', 'Other')
-        weight = h.get('weight', 0)
-        ret = h.get('return', 0)
-
-        if asset_class not in asset_class_data:
-            asset_class_data[asset_class] = {
-                'weight': 0,
-                'return': 0,
-                'contribution': 0,
-                'holdings': []
-            }
-
-        asset_class_data[asset_class]['weight'] += weight
-        asset_class_data[asset_class]['holdings'].append(h)
-
-    # Calculate weighted returns and contributions
-    for asset_class, data in asset_class_data.items():
-        if data['weight'] > 0:
-            weighted_return = sum(
-                h.get('weight', 0) * h.get('return', 0)
-                for h in data['holdings']
-            ) / data['weight']
-            data['return'] = weighted_return
-            data['contribution'] = data['weight'] * weighted_return / 100
-            total_portfolio_return += data['contribution']
+    # Group on integer codes rather than the labels themselves, so a null
+    # asset_class still gets its own group (keyed None) instead of being dropped
+    class_codes = {}
+    codes = [class_codes.setdefault(h.get('asset_class', 'Other'), len(class_codes)) for h in holdings]
+    asset_classes = list(class_codes)
+
+    df = pd.DataFrame({
+        'asset_class': codes,
+        'weight': [h.get('weight', 0) for h in holdings],
+        'return': [h.get('return', 0) for h in holdings],
+    })
+    df['weighted'] = df['weight'] * df['return']
+
+    # Weight and weight*return per asset class in one groupby
+    grouped = df.groupby('asset_class', sort=False)
+    agg = grouped.agg(weight=('weight', 'sum'), weighted=('weighted', 'sum'))
+    has_weight = agg['weight'] > 0
+    agg['return'] = (agg['weighted'] / agg['weight'].where(has_weight)).fillna(0.0)
+    agg['contribution'] = agg['weight'] * agg['return'] / 100
+
+    total_portfolio_return = float(agg['contribution'].sum())
+
+    positions = grouped.indices
+    asset_class_data = {
+        asset_classes[code]: {
+            'weight': float(weight),
+            'return': float(ret),
+            'contribution': float(contribution),
+            'holdings': [holdings[i] for i in positions[code]]
+        }
+        for code, weight, ret, contribution in zip(
+            agg.index, agg['weight'], agg['return'], agg['contribution']
+        )
+    }
 
     # Calculate alpha (excess return vs benchmark)
     alpha = total_portfolio_return - benchmark_return
@@ -324,7 +490,8 @@ def calculate_risk_metrics(returns: List[float]) -> Dict[str, float]:
             'avg_return': 0
         }
 
-    returns_array = np.array(returns)
+    # Single precision is ample for risk metrics and halves memory traffic
+    returns_array = np.asarray(returns, dtype=np.float32)
 
     # Volatility (standard deviation of returns)
     volatility = np.std(returns_array)
@@ -339,20 +506,37 @@ def calculate_risk_metrics(returns: List[float]) -> Dict[str, float]:
     else:
         sharpe_ratio = 0
 
-    # Max drawdown
-    cumulative = np.cumprod(1 + returns_array / 100)
-    running_max = np.maximum.accumulate(cumulative)
-    drawdowns = (cumulative - running_max) / running_max * 100
-    max_drawdown = np.min(drawdowns)
+    max_drawdown = _max_drawdown(returns_array)
 
     return {
-        'volatility': volatility,
-        'sharpe_ratio': sharpe_ratio,
-        'max_drawdown': max_drawdown,
-        'avg_return': avg_return
+        'volatility': float(volatility),
+        'sharpe_ratio': float(sharpe_ratio),
+        'max_drawdown': float(max_drawdown),
+        'avg_return': float(avg_return)
     }
 
 
+@njit(cache=True)
+def _max_drawdown(returns):
+    """
+    Max drawdown (as a negative percentage) of a series of percentage returns.
+
+    Tracks the cumulative value, running peak and worst drawdown in one pass
+    instead of materializing cumprod / running-max / drawdown arrays.
+    """
+    cumulative = 1.0
+    peak = 1.0
+    worst = 0.0
+    for i in range(len(returns)):
+        cumulative *= 1.0 + returns[i] / 100.0
+        if i == 0 or cumulative > peak:
+            peak = cumulative
+        drawdown = (cumulative - peak) / peak
+        if drawdown < worst:
+            worst = drawdown
+    return worst * 100.0
+
+
 def calculate_concentration_risk(holdings: List[Dict], threshold_pct: float = 20) -> Dict:
     """
     Calculate concentration risk.
@@ -364,30 +548,26 @@ def calculate_concentration_risk(holdings: List[Dict], threshold_pct: float = 20
     Returns:
         Concentration analysis
     """
-    total_value = sum(h.get('value', 0) for h in holdings)
+    values = np.fromiter((h.get('value', 0) for h in holdings), dtype=np.float64, count=len(holdings))
+    total_value = values.sum()
 
     if total_value == 0:
         return {'concentrated_positions': [], 'hhi': 0}
 
-    concentrated = []
-    weights_squared = 0
-
-    for h in holdings:
-        value = h.get('value', 0)
-        weight = (value / total_value) * 100
-
-        weights_squared += (weight / 100) ** 2
-
-        if weight >= threshold_pct:
-            concentrated.append({
-                'name': h.get('name', 'Unknown'),
-                'value': value,
-                'weight': weight,
-                'asset_class': h.get('asset_class', 'Unknown')
-            })
+    weights = values / total_value * 100
 
     # Herfindahl-Hirschman Index (HHI)
-    hhi = weights_squared * 10000
+    hhi = float(np.sum((weights / 100) ** 2) * 10000)
+
+    concentrated = [
+        {
+            'name': holdings[i].get('name', 'Unknown'),
+            'value': holdings[i].get('value', 0),
+            'weight': float(weights[i]),
+            'asset_class': holdings[i].get('asset_class', 'Unknown')
+        }
+        for i in np.flatnonzero(weights >= threshold_pct)
+    ]
 
     return {
         'concentrated_positions': concentrated,
@@ -495,14 +675,18 @@ def calculate_cost_basis_adjustment(
     }
 
 
+_CURRENCY_PREFIX = {'CAD': 'C$', 'USD': 'US$'}
+
+
 def format_currency(amount: float, currency: str = 'CAD') -> str:
     """Format amount as currency string"""
-    if currency == 'CAD':
-        return f"C${amount:,.2f}"
-    elif currency == 'USD':
-        return f"US${amount:,.2f}"
-    else:
-        return f"{currency} {amount:,.2f}"
+    return f"{_CURRENCY_PREFIX.get(currency) or f'{currency} '}{amount:,.2f}"
+
+
+def format_currency_array(amounts, currency: str = 'CAD') -> List[str]:
+    """Format many amounts in one currency, looking up the prefix once"""
+    prefix = _CURRENCY_PREFIX.get(currency) or f'{currency} '
+    return [f"{prefix}{amount:,.2f}" for amount in np.asarray(amounts, dtype=np.float64).tolist()]
 
 
 def format_percentage(value: float, decimals: int = 2) -> str:
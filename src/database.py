@@ -4,21 +4,57 @@ Uses SQLAlchemy with SQLite for local storage.
 """
 
 import os
+import datetime as dt
 from datetime import datetime, date
 from decimal import Decimal
+from itertools import groupby
+from operator import itemgetter
 from typing import Optional, List
-from sqlalchemy import create_engine, Column, Integer, String, Float, Date, DateTime, Boolean, ForeignKey, Enum, Text
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
+from weakref import WeakKeyDictionary
+from sqlalchemy import create_engine, event, select, Integer, String, Float, Date, DateTime, Boolean, ForeignKey, Enum, Text, Index, case, func, update
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, sessionmaker, relationship, joinedload
 import enum
 
 # Database path
 DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'investments.db')
 
-# Create engine
-engine = create_engine(f'sqlite:///{DB_PATH}', echo=False)
+# Create engine (no connection is opened until first use)
+engine = create_engine(
+    f'sqlite:///{DB_PATH}', echo=False,
+    connect_args={'check_same_thread': False}
+)
+
+
+@event.listens_for(engine, 'connect')
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Use WAL journaling and relaxed fsync for faster commits."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA cache_size=-64000')
+    cursor.execute('PRAGMA temp_store=MEMORY')
+    cursor.execute('PRAGMA mmap_size=268435456')
+    cursor.close()
+
+
 Session = sessionmaker(bind=engine)
-Base = declarative_base()
+
+# Values bound per IN (...) clause, well under SQLite's bound-variable
+# limit (999 before 3.32, 32766 since)
+IN_CLAUSE_BATCH_SIZE = 500
+
+
+def in_batches(values, size: int = None):
+    """Split values into lists short enough for one IN (...) clause each."""
+    values = list(values)
+    size = size or IN_CLAUSE_BATCH_SIZE
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+class Base(DeclarativeBase):
+    pass
 
 
 class AssetClass(enum.Enum):
@@ -52,206 +88,223 @@ class Entity(Base):
     """Investment entity (HoldCo, Personal, etc.)"""
     __tablename__ = 'entities'
 
-    id = Column(Integer, primary_key=True)
-    name = Column(String(100), nullable=False, unique=True)
-    entity_type = Column(String(50))  # corporation, individual, trust, etc.
-    description = Column(Text)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String(100), nullable=False, unique=True)
+    entity_type: Mapped[Optional[str]] = mapped_column(String(50))  # corporation, individual, trust, etc.
+    description: Mapped[Optional[str]] = mapped_column(Text)
+    created_at: Mapped[Optional[dt.datetime]] = mapped_column(DateTime, default=datetime.utcnow)
 
     # Relationships
-    investments = relationship("Investment", back_populates="entity")
+    investments: Mapped[List["Investment"]] = relationship("Investment", back_populates="entity")
 
 
 class Investment(Base):
     """Individual investment/position"""
     __tablename__ = 'investments'
 
-    id = Column(Integer, primary_key=True)
-    name = Column(String(200), nullable=False)
-    symbol = Column(String(20))  # For public equities, crypto
-    asset_class = Column(String(50), nullable=False)
-    entity_id = Column(Integer, ForeignKey('entities.id'), nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String(200), nullable=False)
+    symbol: Mapped[Optional[str]] = mapped_column(String(20))  # For public equities, crypto
+    asset_class: Mapped[str] = mapped_column(String(50), nullable=False)
+    entity_id: Mapped[int] = mapped_column(Integer, ForeignKey('entities.id'), nullable=False)
 
     # Currency
-    currency = Column(String(3), default='CAD')
+    currency: Mapped[Optional[str]] = mapped_column(String(3), default='CAD')
 
     # Current position
-    quantity = Column(Float, default=0)
-    cost_basis = Column(Float, default=0)  # Total cost basis
-    cost_per_unit = Column(Float, default=0)
+    quantity: Mapped[Optional[float]] = mapped_column(Float, default=0)
+    cost_basis: Mapped[Optional[float]] = mapped_column(Float, default=0)  # Total cost basis
+    cost_per_unit: Mapped[Optional[float]] = mapped_column(Float, default=0)
 
     # Current valuation
-    current_price = Column(Float, default=0)
-    current_value = Column(Float, default=0)
-    last_price_update = Column(DateTime)
+    current_price: Mapped[Optional[float]] = mapped_column(Float, default=0)
+    current_value: Mapped[Optional[float]] = mapped_column(Float, default=0)
+    last_price_update: Mapped[Optional[dt.datetime]] = mapped_column(DateTime)
 
     # For illiquid investments
-    last_nav = Column(Float)  # Last reported NAV
-    last_nav_date = Column(Date)
+    last_nav: Mapped[Optional[float]] = mapped_column(Float)  # Last reported NAV
+    last_nav_date: Mapped[Optional[dt.date]] = mapped_column(Date)
 
     # Metadata
-    purchase_date = Column(Date)  # Initial purchase
-    notes = Column(Text)
-    is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    purchase_date: Mapped[Optional[dt.date]] = mapped_column(Date)  # Initial purchase
+    notes: Mapped[Optional[str]] = mapped_column(Text)
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
+    created_at: Mapped[Optional[dt.datetime]] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[Optional[dt.datetime]] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # For market data lookup
-    exchange = Column(String(20))  # TSX, NYSE, NASDAQ, etc.
-    data_source = Column(String(50))  # yahoo, kraken, manual
+    exchange: Mapped[Optional[str]] = mapped_column(String(20))  # TSX, NYSE, NASDAQ, etc.
+    data_source: Mapped[Optional[str]] = mapped_column(String(50))  # yahoo, kraken, manual
 
     # Relationships
-    entity = relationship("Entity", back_populates="investments")
-    transactions = relationship("Transaction", back_populates="investment", order_by="Transaction.date")
-    valuations = relationship("Valuation", back_populates="investment", order_by="Valuation.date")
+    entity: Mapped["Entity"] = relationship("Entity", back_populates="investments")
+    transactions: Mapped[List["Transaction"]] = relationship("Transaction", back_populates="investment", order_by="Transaction.date")
+    valuations: Mapped[List["Valuation"]] = relationship("Valuation", back_populates="investment", order_by="Valuation.date")
 
-    @property
+    @hybrid_property
     def unrealized_gain(self) -> float:
         """Calculate unrealized gain/loss"""
         return self.current_value - self.cost_basis
 
-    @property
+    @hybrid_property
     def unrealized_gain_pct(self) -> float:
         """Calculate unrealized gain/loss percentage"""
         if self.cost_basis == 0:
             return 0
         return (self.current_value - self.cost_basis) / self.cost_basis * 100
 
+    @unrealized_gain_pct.expression
+    def unrealized_gain_pct(cls):
+        """SQL form, so queries can filter and sort by gain without loading rows"""
+        return case(
+            (cls.cost_basis == 0, 0),
+            else_=(cls.current_value - cls.cost_basis) / cls.cost_basis * 100
+        )
+
 
 class Transaction(Base):
     """Investment transactions"""
     __tablename__ = 'transactions'
+    __table_args__ = (
+        Index('ix_tx_inv_date', 'investment_id', 'date'),
+    )
 
-    id = Column(Integer, primary_key=True)
-    investment_id = Column(Integer, ForeignKey('investments.id'), nullable=False)
-    transaction_type = Column(String(50), nullable=False)
-    date = Column(Date, nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    investment_id: Mapped[int] = mapped_column(Integer, ForeignKey('investments.id'), nullable=False)
+    transaction_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    date: Mapped[dt.date] = mapped_column(Date, nullable=False)
 
     # Transaction details
-    quantity = Column(Float, default=0)
-    price_per_unit = Column(Float, default=0)
-    total_amount = Column(Float, nullable=False)
-    currency = Column(String(3), default='CAD')
-    fx_rate = Column(Float, default=1.0)  # FX rate to CAD at time of transaction
+    quantity: Mapped[Optional[float]] = mapped_column(Float, default=0)
+    price_per_unit: Mapped[Optional[float]] = mapped_column(Float, default=0)
+    total_amount: Mapped[float] = mapped_column(Float, nullable=False)
+    currency: Mapped[Optional[str]] = mapped_column(String(3), default='CAD')
+    fx_rate: Mapped[Optional[float]] = mapped_column(Float, default=1.0)  # FX rate to CAD at time of transaction
 
     # Fees and taxes
-    fees = Column(Float, default=0)
-    taxes_withheld = Column(Float, default=0)
+    fees: Mapped[Optional[float]] = mapped_column(Float, default=0)
+    taxes_withheld: Mapped[Optional[float]] = mapped_column(Float, default=0)
 
     # For tracking realized gains
-    realized_gain = Column(Float, default=0)
+    realized_gain: Mapped[Optional[float]] = mapped_column(Float, default=0)
 
     # Metadata
-    notes = Column(Text)
-    reference = Column(String(100))  # External reference number
-    created_at = Column(DateTime, default=datetime.utcnow)
+    notes: Mapped[Optional[str]] = mapped_column(Text)
+    reference: Mapped[Optional[str]] = mapped_column(String(100))  # External reference number
+    created_at: Mapped[Optional[dt.datetime]] = mapped_column(DateTime, default=datetime.utcnow)
 
     # Relationships
-    investment = relationship("Investment", back_populates="transactions")
+    investment: Mapped["Investment"] = relationship("Investment", back_populates="transactions")
 
 
 class Valuation(Base):
     """Manual valuations for illiquid investments"""
     __tablename__ = 'valuations'
+    __table_args__ = (
+        Index('ix_valuations_inv_date', 'investment_id', 'date'),
+    )
 
-    id = Column(Integer, primary_key=True)
-    investment_id = Column(Integer, ForeignKey('investments.id'), nullable=False)
-    date = Column(Date, nullable=False)
-    value = Column(Float, nullable=False)
-    value_per_unit = Column(Float)
-    source = Column(String(100))  # NAV statement, appraisal, etc.
-    notes = Column(Text)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    investment_id: Mapped[int] = mapped_column(Integer, ForeignKey('investments.id'), nullable=False)
+    date: Mapped[dt.date] = mapped_column(Date, nullable=False)
+    value: Mapped[float] = mapped_column(Float, nullable=False)
+    value_per_unit: Mapped[Optional[float]] = mapped_column(Float)
+    source: Mapped[Optional[str]] = mapped_column(String(100))  # NAV statement, appraisal, etc.
+    notes: Mapped[Optional[str]] = mapped_column(Text)
+    created_at: Mapped[Optional[dt.datetime]] = mapped_column(DateTime, default=datetime.utcnow)
 
     # Relationships
-    investment = relationship("Investment", back_populates="valuations")
+    investment: Mapped["Investment"] = relationship("Investment", back_populates="valuations")
 
 
 class FXRate(Base):
     """Historical FX rates"""
     __tablename__ = 'fx_rates'
+    __table_args__ = (
+        Index('ix_fx_currencies_date', 'from_currency', 'to_currency', 'date'),
+    )
 
-    id = Column(Integer, primary_key=True)
-    from_currency = Column(String(3), nullable=False)
-    to_currency = Column(String(3), nullable=False)
-    date = Column(Date, nullable=False)
-    rate = Column(Float, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    from_currency: Mapped[str] = mapped_column(String(3), nullable=False)
+    to_currency: Mapped[str] = mapped_column(String(3), nullable=False)
+    date: Mapped[dt.date] = mapped_column(Date, nullable=False)
+    rate: Mapped[float] = mapped_column(Float, nullable=False)
+    created_at: Mapped[Optional[dt.datetime]] = mapped_column(DateTime, default=datetime.utcnow)
 
 
 class Benchmark(Base):
     """Benchmark performance data"""
     __tablename__ = 'benchmarks'
 
-    id = Column(Integer, primary_key=True)
-    symbol = Column(String(20), nullable=False)
-    name = Column(String(100))
-    date = Column(Date, nullable=False)
-    close_price = Column(Float, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    symbol: Mapped[str] = mapped_column(String(20), nullable=False)
+    name: Mapped[Optional[str]] = mapped_column(String(100))
+    date: Mapped[dt.date] = mapped_column(Date, nullable=False)
+    close_price: Mapped[float] = mapped_column(Float, nullable=False)
+    created_at: Mapped[Optional[dt.datetime]] = mapped_column(DateTime, default=datetime.utcnow)
 
 
 class PortfolioSnapshot(Base):
     """Daily portfolio snapshots for performance tracking"""
     __tablename__ = 'portfolio_snapshots'
 
-    id = Column(Integer, primary_key=True)
-    date = Column(Date, nullable=False)
-    total_value_cad = Column(Float, nullable=False)
-    total_cost_basis = Column(Float, nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    date: Mapped[dt.date] = mapped_column(Date, nullable=False)
+    total_value_cad: Mapped[float] = mapped_column(Float, nullable=False)
+    total_cost_basis: Mapped[float] = mapped_column(Float, nullable=False)
 
     # By entity
-    entity_id = Column(Integer, ForeignKey('entities.id'))
+    entity_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey('entities.id'))
 
     # Allocation snapshot (JSON stored as text)
-    allocation_json = Column(Text)
+    allocation_json: Mapped[Optional[str]] = mapped_column(Text)
 
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[Optional[dt.datetime]] = mapped_column(DateTime, default=datetime.utcnow)
 
 
 class Risk(Base):
     """Risk register entry."""
     __tablename__ = 'risks'
 
-    id = Column(Integer, primary_key=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
 
     # Core fields
-    title = Column(String(300), nullable=False)
-    description = Column(Text)
-    category = Column(String(50), nullable=False)  # Financial, Operational, Legal, etc.
+    title: Mapped[str] = mapped_column(String(300), nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(Text)
+    category: Mapped[str] = mapped_column(String(50), nullable=False)  # Financial, Operational, Legal, etc.
 
     # Entity linkage
-    entity_id = Column(Integer, ForeignKey('entities.id'), nullable=True)
+    entity_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey('entities.id'), nullable=True)
 
     # Optional linkage to investments
-    investment_id = Column(Integer, ForeignKey('investments.id'), nullable=True)
+    investment_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey('investments.id'), nullable=True)
 
     # Risk owner
-    risk_owner = Column(String(200))
+    risk_owner: Mapped[Optional[str]] = mapped_column(String(200))
 
     # Assessment scales (0-5)
-    likelihood = Column(Integer, default=0)
-    impact = Column(Integer, default=0)
-    risk_score = Column(Integer, default=0)  # likelihood * impact
+    likelihood: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    impact: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    risk_score: Mapped[Optional[int]] = mapped_column(Integer, default=0)  # likelihood * impact
 
     # Status
-    status = Column(String(50), default='Identified')
+    status: Mapped[Optional[str]] = mapped_column(String(50), default='Identified')
 
     # Mitigation
-    mitigation_plan = Column(Text)
-    mitigation_actions = Column(Text)
+    mitigation_plan: Mapped[Optional[str]] = mapped_column(Text)
+    mitigation_actions: Mapped[Optional[str]] = mapped_column(Text)
 
     # Review schedule
-    review_frequency = Column(String(50))  # Monthly, Quarterly, Semi-annually, Annually
-    next_review_date = Column(Date)
+    review_frequency: Mapped[Optional[str]] = mapped_column(String(50))  # Monthly, Quarterly, Semi-annually, Annually
+    next_review_date: Mapped[Optional[dt.date]] = mapped_column(Date)
 
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[Optional[dt.datetime]] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[Optional[dt.datetime]] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
-    entity = relationship("Entity")
-    investment = relationship("Investment")
+    entity: Mapped[Optional["Entity"]] = relationship("Entity")
+    investment: Mapped[Optional["Investment"]] = relationship("Investment")
 
 
 # Database operations
@@ -260,6 +313,11 @@ def init_db():
     os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
     Base.metadata.create_all(engine)
 
+    # create_all skips tables that already exist, so add any missing indexes
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
     # Create default entities if they don't exist
     session = Session()
     try:
@@ -274,8 +332,20 @@ def init_db():
         session.close()
 
 
+_initialized = False
+
+
+def ensure_initialized():
+    """Run init_db once per process."""
+    global _initialized
+    if not _initialized:
+        init_db()
+        _initialized = True
+
+
 def get_session():
     """Get a database session"""
+    ensure_initialized()
     return Session()
 
 
@@ -331,49 +401,119 @@ def add_transaction(session, **kwargs) -> Transaction:
     """Add a new transaction"""
     transaction = Transaction(**kwargs)
     session.add(transaction)
-    session.commit()
 
-    # Update investment position
-    update_investment_position(session, transaction.investment_id)
+    # Update investment position in the same commit
+    update_investment_position(session, transaction.investment_id, commit=False)
+    session.commit()
 
     return transaction
 
 
-def update_investment_position(session, investment_id: int):
+# Transaction types that add to or reduce a position
+_INFLOW_TYPES = frozenset(('Buy', 'Capital Call', 'Transfer In'))
+_OUTFLOW_TYPES = frozenset(('Sell', 'Capital Return', 'Transfer Out'))
+
+
+def _replay_position(transactions) -> tuple:
+    """
+    Replay (transaction_type, quantity, total_amount, date) rows in date order
+    using the average cost method.
+
+    Returns:
+        (quantity, cost_basis, first purchase date or None)
+    """
+    quantity = 0
+    cost_basis = 0
+    purchase_date = None
+
+    for transaction_type, tx_quantity, total_amount, tx_date in transactions:
+        if transaction_type in _INFLOW_TYPES:
+            quantity += tx_quantity
+            cost_basis += total_amount
+            if purchase_date is None:
+                purchase_date = tx_date
+        elif transaction_type in _OUTFLOW_TYPES:
+            if quantity > 0:
+                # Calculate cost basis for sold units (average cost method)
+                avg_cost_per_unit = cost_basis / quantity if quantity else 0
+                cost_basis -= avg_cost_per_unit * tx_quantity
+            quantity -= tx_quantity
+
+    return quantity, cost_basis, purchase_date
+
+
+def update_investment_position(session, investment_id: int, commit: bool = True):
     """Recalculate investment position from transactions"""
     investment = get_investment_by_id(session, investment_id)
     if not investment:
         return
 
-    transactions = session.query(Transaction).filter(
+    transactions = session.query(
+        Transaction.transaction_type, Transaction.quantity, Transaction.total_amount, Transaction.date
+    ).filter(
         Transaction.investment_id == investment_id
     ).order_by(Transaction.date).all()
 
-    quantity = 0
-    cost_basis = 0
-
-    for tx in transactions:
-        if tx.transaction_type in ['Buy', 'Capital Call', 'Transfer In']:
-            quantity += tx.quantity
-            cost_basis += tx.total_amount
-        elif tx.transaction_type in ['Sell', 'Capital Return', 'Transfer Out']:
-            if quantity > 0:
-                # Calculate cost basis for sold units (average cost method)
-                avg_cost_per_unit = cost_basis / quantity if quantity else 0
-                cost_basis -= avg_cost_per_unit * tx.quantity
-            quantity -= tx.quantity
+    quantity, cost_basis, purchase_date = _replay_position(transactions)
 
     investment.quantity = quantity
     investment.cost_basis = cost_basis
     investment.cost_per_unit = cost_basis / quantity if quantity > 0 else 0
 
     # Update purchase date to first transaction
-    if transactions:
-        buy_transactions = [t for t in transactions if t.transaction_type in ['Buy', 'Capital Call', 'Transfer In']]
-        if buy_transactions:
-            investment.purchase_date = buy_transactions[0].date
+    if purchase_date is not None:
+        investment.purchase_date = purchase_date
+
+    if commit:
+        session.commit()
 
-    session.commit()
+
+def update_investment_position_bulk(session, investment_ids: List[int]):
+    """
+    Recalculate positions for many investments at once.
+
+    Loads the transactions for each batch of investments in one query,
+    replays each investment's rows, and writes the batch's positions back
+    with a single bulk UPDATE, committing once at the end.
+    """
+    updated = False
+    for batch in in_batches(set(investment_ids)):
+        existing_ids = [
+            row.id for row in session.query(Investment.id).filter(Investment.id.in_(batch))
+        ]
+        if not existing_ids:
+            continue
+
+        rows = session.query(
+            Transaction.investment_id, Transaction.transaction_type,
+            Transaction.quantity, Transaction.total_amount, Transaction.date
+        ).filter(
+            Transaction.investment_id.in_(existing_ids)
+        ).order_by(Transaction.investment_id, Transaction.date).all()
+
+        positions = {
+            investment_id: _replay_position(row[1:] for row in group)
+            for investment_id, group in groupby(rows, key=itemgetter(0))
+        }
+
+        updates = []
+        for investment_id in existing_ids:
+            quantity, cost_basis, purchase_date = positions.get(investment_id, (0, 0, None))
+            values = {
+                'id': investment_id,
+                'quantity': quantity,
+                'cost_basis': cost_basis,
+                'cost_per_unit': cost_basis / quantity if quantity > 0 else 0,
+            }
+            if purchase_date is not None:
+                values['purchase_date'] = purchase_date
+            updates.append(values)
+
+        session.execute(update(Investment), updates)
+        updated = True
+
+    if updated:
+        session.commit()
 
 
 def add_valuation(session, investment_id: int, date: date, value: float, source: str = None, notes: str = None) -> Valuation:
@@ -404,17 +544,83 @@ def add_valuation(session, investment_id: int, date: date, value: float, source:
     return valuation
 
 
+# Latest FX rates per database bind, as (day, {(from_currency, to_currency): rate}),
+# shared across sessions. Only rates found in the database are cached; a bind's
+# rates are dropped when the day changes or an FXRate row is written through the ORM.
+_fx_rate_caches = WeakKeyDictionary()
+
+
+@event.listens_for(FXRate, 'after_insert')
+@event.listens_for(FXRate, 'after_update')
+@event.listens_for(FXRate, 'after_delete')
+def _clear_fx_rate_cache(mapper, connection, target):
+    _fx_rate_caches.pop(connection.engine, None)
+
+
+def _fx_rates_for(session) -> dict:
+    """Today's cached FX rates for the session's database."""
+    bind = session.get_bind()
+    today = date.today()
+    cached = _fx_rate_caches.get(bind)
+    if cached is None or cached[0] != today:
+        cached = _fx_rate_caches[bind] = (today, {})
+    return cached[1]
+
+
 def get_latest_fx_rate(session, from_currency: str, to_currency: str) -> float:
     """Get the latest FX rate"""
     if from_currency == to_currency:
         return 1.0
 
-    rate = session.query(FXRate).filter(
+    rates = _fx_rates_for(session)
+    cached = rates.get((from_currency, to_currency))
+    if cached is not None:
+        return cached
+
+    rate = session.query(FXRate.rate).filter(
         FXRate.from_currency == from_currency,
         FXRate.to_currency == to_currency
     ).order_by(FXRate.date.desc()).first()
 
-    return rate.rate if rate else 1.0
+    # No stored rate: fall back to 1.0 without caching, so a rate saved
+    # later (e.g. by a sheet sync in another process) is picked up
+    if rate is None:
+        return 1.0
+
+    rates[(from_currency, to_currency)] = rate.rate
+    return rate.rate
+
+
+def get_latest_fx_rates(session, from_currencies, to_currency: str) -> dict:
+    """
+    Get the latest FX rate for several currencies in one round-trip.
+
+    Returns a dict of from_currency -> rate. Currencies with no stored
+    rate (and to_currency itself) map to 1.0.
+    """
+    rates = {currency: 1.0 for currency in from_currencies}
+    lookup = set(from_currencies) - {to_currency}
+    if not lookup:
+        return rates
+
+    latest = session.query(
+        FXRate.from_currency,
+        func.max(FXRate.date).label('max_date')
+    ).filter(
+        FXRate.from_currency.in_(lookup),
+        FXRate.to_currency == to_currency
+    ).group_by(FXRate.from_currency).subquery()
+
+    rows = session.query(FXRate.from_currency, FXRate.rate).join(
+        latest,
+        (FXRate.from_currency == latest.c.from_currency) & (FXRate.date == latest.c.max_date)
+    ).filter(FXRate.to_currency == to_currency).order_by(FXRate.id).all()
+
+    # If several rows share the latest date, the most recently saved one wins
+    for from_currency, rate in rows:
+        rates[from_currency] = rate
+
+    return rates
 
 
 def save_fx_rate(session, from_currency: str, to_currency: str, rate_date: date, rate: float):
@@ -427,11 +633,19 @@ def save_fx_rate(session, from_currency: str, to_currency: str, rate_date: date,
     )
     session.add(fx_rate)
     session.commit()
+    # The insert listener already cleared the cache at flush; clear again so
+    # a read that raced the commit can't leave the old rate behind
+    _fx_rate_caches.pop(session.get_bind(), None)
 
 
 def get_portfolio_summary(session) -> dict:
     """Get a summary of the entire portfolio"""
-    investments = get_all_investments(session, active_only=True)
+    investments = session.scalars(
+        select(Investment).options(joinedload(Investment.entity)).where(Investment.is_active == True)
+    ).unique().all()
+
+    # One FX query for all currencies instead of one per holding
+    fx_rates = get_latest_fx_rates(session, {inv.currency for inv in investments}, 'CAD')
 
     total_value_cad = 0
     total_cost_basis = 0
@@ -440,7 +654,7 @@ def get_portfolio_summary(session) -> dict:
 
     for inv in investments:
         # Convert to CAD if needed
-        fx_rate = get_latest_fx_rate(session, inv.currency, 'CAD')
+        fx_rate = fx_rates.get(inv.currency, 1.0)
         value_cad = inv.current_value * fx_rate
         cost_cad = inv.cost_basis * fx_rate
 
@@ -587,7 +801,3 @@ def seed_risk_data(session):
     for risk in risks:
         session.add(risk)
     session.commit()
-
-
-# Initialize database on module import
-init_db()
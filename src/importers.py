@@ -4,20 +4,63 @@ Supports CSV/Excel import and Google Sheets integration.
 """
 
 import os
+import re
+import numpy as np
 import pandas as pd
 import yaml
 from datetime import datetime, date
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 import json
 
+from sqlalchemy import event, update
+
 from .database import (
     get_session, Entity, Investment, Transaction, Valuation,
     add_investment, add_transaction, add_valuation,
-    get_all_entities, get_investment_by_symbol
+    get_all_entities, in_batches
 )
 
+# Rust-based Excel reader, much faster than openpyxl when installed.
+# Otherwise pandas picks by extension (openpyxl, already in read-only mode, for .xlsx)
+try:
+    import python_calamine  # noqa: F401
+    CALAMINE_AVAILABLE = True
+    EXCEL_ENGINE = 'calamine'
+except ImportError:
+    CALAMINE_AVAILABLE = False
+    EXCEL_ENGINE = None
+
+# Multithreaded CSV reader, called directly rather than through
+# read_csv(engine='pyarrow'), which casts dtype only after inferring types
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config.yaml')
 
+# Entity name -> id per database bind, cleared whenever an entity changes
+_entity_maps = {}
+
+
+def _entity_map(session) -> Dict[str, int]:
+    """Get the entity name -> id map for the session's database."""
+    bind = session.get_bind()
+    entities = _entity_maps.get(bind)
+    if entities is None:
+        entities = _entity_maps[bind] = {e.name: e.id for e in get_all_entities(session)}
+    return entities
+
+
+@event.listens_for(Entity, 'after_insert')
+@event.listens_for(Entity, 'after_update')
+@event.listens_for(Entity, 'after_delete')
+def _clear_entity_maps(mapper, connection, target):
+    _entity_maps.clear()
+
 
 class CSVImporter:
     """Import investments and transactions from CSV/Excel files."""
@@ -106,32 +149,164 @@ class CSVImporter:
         'transfer out': 'Transfer Out',
     }
 
+    # Fields parsed by _parse_number_series; everything else is read as text
+    INVESTMENT_NUMERIC_FIELDS = ('quantity', 'cost_basis', 'cost_per_unit', 'current_value', 'current_price')
+    TRANSACTION_NUMERIC_FIELDS = ('quantity', 'price', 'amount', 'fees')
+
+    # Label columns with only a handful of distinct values
+    CATEGORICAL_COLUMNS = ('entity', 'currency', 'asset_class', 'exchange', 'type')
+
+    # Rows per chunk when streaming CSV imports
+    IMPORT_CHUNK_SIZE = 100_000
+
+    # Normalized previews kept for the import that follows them
+    PREVIEW_CACHE_SIZE = 4
+
+    # Scalar number cleanup: drop $, commas and C in one pass; (x) means -x
+    _STRIP_TABLE = str.maketrans('', '', '$,C')
+    _PAREN_RE = re.compile(r'^\((.+)\)$')
+    # Column number cleanup, shared by every _parse_number_series call
+    _NUMBER_JUNK_RE = re.compile(r'[$,C]|US')
+
+    # Y-M-D, or M-D-Y / D-M-Y, with one consistent '-' or '/' separator
+    _DATE_RE = re.compile(r'^(?:(\d{4})([-/])(\d{1,2})\2(\d{1,2})|(\d{1,2})([-/])(\d{1,2})\6(\d{4}))$')
+
     def __init__(self):
         self.errors = []
         self.warnings = []
+        # (row index, exception) pairs, formatted into errors when a run ends
+        self._row_errors = []
+        # Normalized previews keyed by (kind, path, mtime, size), used up by the next import
+        self._preview_cache = {}
+
+    @staticmethod
+    def _build_column_map(columns, column_mappings: Dict) -> Dict[str, str]:
+        """
+        Map each field to the first matching column in the dataframe.
+
+        Column names are lowercased and stripped once, then each field's
+        possible names are probed against that index.
+        """
+        columns_lower = {c.lower().strip(): c for c in columns}
+        column_map = {}
+
+        for field, possible_names in column_mappings.items():
+            for name in possible_names:
+                col = columns_lower.get(name.lower())
+                if col is not None:
+                    column_map[field] = col
+                    break
+
+        return column_map
+
+    def _warn_unknown_entities(self, df: pd.DataFrame, entities: Dict[str, int], reported: set):
+        """Warn once about entity names that aren't in the database; their rows fall back to HoldCo."""
+        if 'entity' not in df.columns:
+            return
+
+        unknown = {str(name) for name in df['entity'].astype(object).unique() if name not in entities} - reported
+        if unknown:
+            reported.update(unknown)
+            self.warnings.append(f"Unknown entities, using HoldCo: {', '.join(sorted(unknown))}")
+
+    def _flush_row_errors(self):
+        """Format the deferred per-row errors into self.errors."""
+        self.errors.extend("Row {}: {}".format(idx + 1, e) for idx, e in self._row_errors)
+        self._row_errors = []
+
+    @staticmethod
+    def _file_key(kind: str, file_path: Union[str, pd.DataFrame]) -> Optional[tuple]:
+        """Cache key that changes whenever the file on disk does."""
+        if isinstance(file_path, pd.DataFrame):
+            return None
+        stat = os.stat(file_path)
+        return (kind, os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+
+    def _remember_preview(self, key: Optional[tuple], normalized: pd.DataFrame):
+        """Keep a preview for its import, evicting the oldest beyond PREVIEW_CACHE_SIZE."""
+        if key is None:
+            return
+        self._preview_cache.pop(key, None)
+        while len(self._preview_cache) >= self.PREVIEW_CACHE_SIZE:
+            del self._preview_cache[next(iter(self._preview_cache))]
+        self._preview_cache[key] = normalized
+
+    @staticmethod
+    def _is_excel(file_path: str) -> bool:
+        return file_path.endswith('.xlsx') or file_path.endswith('.xls')
+
+    def _read_header(self, file_path: Union[str, pd.DataFrame]) -> pd.Index:
+        """Read only the column names, so the real read can skip unmapped columns."""
+        if isinstance(file_path, pd.DataFrame):
+            return file_path.columns
+
+        if self._is_excel(file_path):
+            return pd.read_excel(file_path, nrows=0, engine=EXCEL_ENGINE).columns
+
+        return pd.read_csv(file_path, nrows=0).columns
+
+    @staticmethod
+    def _text_dtypes(column_map: Dict[str, str], numeric_fields: Tuple[str, ...]) -> Dict[str, type]:
+        """CSV dtypes that read every mapped non-numeric column as text, skipping type inference."""
+        numeric_cols = {col for field, col in column_map.items() if field in numeric_fields}
+        return {col: str for col in column_map.values() if col not in numeric_cols}
+
+    def _read_file(self, file_path: Union[str, pd.DataFrame], usecols: Optional[List[str]] = None,
+                   dtype: Optional[Dict[str, type]] = None) -> pd.DataFrame:
+        """
+        Read a CSV or Excel file into a dataframe; an already-loaded dataframe is returned as is.
 
-    def _find_column(self, df: pd.DataFrame, field: str, column_mappings: Dict) -> Optional[str]:
-        """Find the actual column name in the dataframe for a given field."""
-        possible_names = column_mappings.get(field, [field])
-        df_columns_lower = {c.lower().strip(): c for c in df.columns}
+        dtype only applies to CSVs; Excel cells already carry their types.
+        """
+        if isinstance(file_path, pd.DataFrame):
+            return file_path
 
-        for name in possible_names:
-            if name.lower() in df_columns_lower:
-                return df_columns_lower[name.lower()]
+        if self._is_excel(file_path):
+            return pd.read_excel(file_path, usecols=usecols, engine=EXCEL_ENGINE)
 
-        return None
+        # The pyarrow parser is multithreaded; fall back to the C parser if it
+        # isn't installed or can't parse/cast this file (ArrowInvalid and
+        # pandas' ParserError are both ValueErrors)
+        if PYARROW_AVAILABLE:
+            try:
+                return self._read_csv_arrow(file_path, usecols, dtype)
+            except ValueError:
+                pass
+        return pd.read_csv(file_path, usecols=usecols, dtype=dtype, engine='c')
+
+    @staticmethod
+    def _read_csv_arrow(file_path: str, usecols: Optional[List[str]] = None,
+                        dtype: Optional[Dict[str, type]] = None) -> pd.DataFrame:
+        """
+        Read a CSV with pyarrow, typing the dtype columns as text up front, so
+        they keep their exact cell text (e.g. leading zeros) and blank cells in
+        inferred integer columns come back as NaN like the C parser's.
+        """
+        convert_options = pa_csv.ConvertOptions(
+            include_columns=usecols or [],
+            column_types={col: pa.string() for col in dtype or {}},
+            strings_can_be_null=True,
+        )
+        return pa_csv.read_csv(file_path, convert_options=convert_options).to_pandas()
+
+    def _iter_chunks(self, file_path: Union[str, pd.DataFrame], usecols: Optional[List[str]] = None,
+                     dtype: Optional[Dict[str, type]] = None) -> Iterator[pd.DataFrame]:
+        """Yield a CSV in chunks of IMPORT_CHUNK_SIZE rows; Excel files and dataframes are yielded whole."""
+        if isinstance(file_path, pd.DataFrame) or self._is_excel(file_path):
+            yield self._read_file(file_path, usecols, dtype)
+            return
+
+        # The pyarrow parser has no chunksize support, so stream with the C parser
+        with pd.read_csv(file_path, usecols=usecols, dtype=dtype, chunksize=self.IMPORT_CHUNK_SIZE) as reader:
+            yield from reader
 
     def _normalize_asset_class(self, value: str) -> str:
         """Normalize asset class value to standard format."""
-        if not value:
-            return 'Public Equities'
-        return self.ASSET_CLASS_MAPPING.get(value.lower().strip(), value)
+        return _norm_asset(value)
 
     def _normalize_transaction_type(self, value: str) -> str:
         """Normalize transaction type to standard format."""
-        if not value:
-            return 'Buy'
-        return self.TRANSACTION_TYPE_MAPPING.get(value.lower().strip(), value)
+        return _norm_transaction_type(value)
 
     def _parse_date(self, value) -> Optional[date]:
         """Parse various date formats."""
@@ -142,9 +317,22 @@ class CSVImporter:
             return value if isinstance(value, date) else value.date()
 
         if isinstance(value, str):
-            for fmt in ['%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y', '%Y/%m/%d', '%m-%d-%Y', '%d-%m-%Y']:
+            match = self._DATE_RE.match(value.strip())
+            if not match:
+                return None
+
+            if match.group(1):
+                candidates = ((int(match.group(1)), int(match.group(3)), int(match.group(4))),)
+            else:
+                first, second, year = int(match.group(5)), int(match.group(7)), int(match.group(8))
+                # Month-first, then day-first, as the old strptime chain tried them
+                candidates = ((year, first, second), (year, second, first))
+
+            for year, month, day in candidates:
+                if month > 12:
+                    continue
                 try:
-                    return datetime.strptime(value.strip(), fmt).date()
+                    return date(year, month, day)
                 except ValueError:
                     continue
 
@@ -160,10 +348,11 @@ class CSVImporter:
 
         if isinstance(value, str):
             # Remove currency symbols and commas
-            cleaned = value.replace('$', '').replace(',', '').replace('C', '').replace('US', '').strip()
+            cleaned = value.translate(self._STRIP_TABLE).replace('US', '').strip()
             # Handle parentheses for negative numbers
-            if cleaned.startswith('(') and cleaned.endswith(')'):
-                cleaned = '-' + cleaned[1:-1]
+            match = self._PAREN_RE.match(cleaned)
+            if match:
+                cleaned = '-' + match.group(1)
             try:
                 return float(cleaned)
             except ValueError:
@@ -171,61 +360,153 @@ class CSVImporter:
 
         return 0.0
 
-    def preview_investments(self, file_path: str) -> Tuple[pd.DataFrame, List[str]]:
+    def _to_frame(self, columns: Dict, index: pd.Index) -> pd.DataFrame:
         """
-        Preview investments from a CSV/Excel file.
-
-        Returns:
-            Tuple of (normalized dataframe, list of issues)
+        Build a normalized dataframe in one go from parsed columns and scalar
+        defaults, storing the low-cardinality label columns as categoricals.
         """
-        self.errors = []
-        self.warnings = []
-
-        # Read file
-        if file_path.endswith('.xlsx') or file_path.endswith('.xls'):
-            df = pd.read_excel(file_path)
+        for col in self.CATEGORICAL_COLUMNS:
+            if col in columns:
+                values = columns[col]
+                if isinstance(values, pd.Series):
+                    columns[col] = values.astype('category')
+                else:
+                    columns[col] = pd.Series(values, index=index, dtype='category')
+        return pd.DataFrame(columns, index=index)
+
+    @staticmethod
+    def _normalize_series(s: pd.Series, mapping: Dict[str, str], default: str) -> pd.Series:
+        """Vectorized _normalize_* over a whole column, returned as a categorical."""
+        # Normalize each distinct label once, then remap the integer codes;
+        # missing cells have code -1, which picks the trailing default
+        codes, uniques = pd.factorize(s)
+        labels = []
+        for value in uniques:
+            key = str(value).lower().strip()
+            labels.append(mapping.get(key, value) if key else default)
+        label_codes, categories = pd.factorize(np.array(labels + [default], dtype=object))
+        return pd.Series(
+            pd.Categorical.from_codes(label_codes[codes], categories=categories),
+            index=s.index
+        )
+
+    @staticmethod
+    def _parse_date_series(s: pd.Series) -> pd.Series:
+        """Vectorized _parse_date over a whole column; unparseable cells become None."""
+        if pd.api.types.is_datetime64_any_dtype(s):
+            parsed = s
+        elif pd.api.types.is_numeric_dtype(s):
+            return pd.Series([None] * len(s), index=s.index, dtype=object)
         else:
-            df = pd.read_csv(file_path)
+            # ISO dates parse in C; 'mixed' infers per cell, so it only sees the
+            # leftovers, and day-first (e.g. 25/12/2024) only what that misses
+            parsed = pd.to_datetime(s, errors='coerce', cache=True, format='ISO8601')
+            for options in ({'format': 'mixed'}, {'format': 'mixed', 'dayfirst': True}):
+                retry = parsed.isna() & s.notna()
+                if not retry.any():
+                    break
+                parsed = parsed.where(~retry, pd.to_datetime(
+                    s[retry], errors='coerce', cache=True, **options
+                ))
+
+        return parsed.dt.date.astype(object).where(parsed.notna(), None)
+
+    @staticmethod
+    def _downcast_series(s: pd.Series, integer: bool = False) -> pd.Series:
+        """Shrink a parsed numeric column to a smaller dtype when no value changes."""
+        if integer:
+            downcast = pd.to_numeric(s, downcast='integer')
+            if downcast.dtype.kind == 'i':
+                return downcast
+
+        # pandas' own float downcast tolerates rounding; only accept exact float32s
+        as_float32 = s.astype(np.float32)
+        if (as_float32 == s).all():
+            return as_float32
+        return s
+
+    @classmethod
+    def _parse_number_series(cls, s: pd.Series) -> pd.Series:
+        """Vectorized _parse_number over a whole column."""
+        if pd.api.types.is_numeric_dtype(s):
+            return s.fillna(0.0).astype(float)
+
+        # Plain numbers (including ones mixed into an object column) parse in C;
+        # only the cells that fail go through the string cleanup
+        parsed = pd.to_numeric(s, errors='coerce')
+        retry = parsed.isna() & s.notna()
+        if retry.any():
+            # Same cleanup as _parse_number: drop $, commas, C and US, then (x) -> -x
+            cleaned = (
+                s[retry].astype('string')
+                .str.replace(cls._NUMBER_JUNK_RE, '', regex=True)
+                .str.strip()
+                .str.replace(cls._PAREN_RE, r'-\1', regex=True)
+            )
+            parsed = parsed.where(~retry, pd.to_numeric(cleaned, errors='coerce'))
+        return parsed.fillna(0.0).astype(float)
 
-        # Find columns
-        column_map = {}
-        for field in self.INVESTMENT_COLUMNS.keys():
-            col = self._find_column(df, field, self.INVESTMENT_COLUMNS)
-            if col:
-                column_map[field] = col
-            elif field in ['name']:
-                self.errors.append(f"Required column '{field}' not found")
+    def _map_investment_columns(self, columns) -> Dict[str, str]:
+        """Map investment fields to file columns, recording missing required ones in self.errors."""
+        column_map = self._build_column_map(columns, self.INVESTMENT_COLUMNS)
+        if 'name' not in column_map:
+            self.errors.append("Required column 'name' not found")
 
-        if self.errors:
-            return pd.DataFrame(), self.errors
+        return column_map
 
-        # Build normalized dataframe
-        normalized = pd.DataFrame()
+    def _normalize_investments(self, df: pd.DataFrame, column_map: Dict[str, str]) -> pd.DataFrame:
+        """Build the normalized investments dataframe for a file or chunk."""
+        normalized = {}
 
         for field, col in column_map.items():
             if field == 'asset_class':
-                normalized[field] = df[col].apply(self._normalize_asset_class)
+                normalized[field] = self._normalize_series(df[col], self.ASSET_CLASS_MAPPING, 'Public Equities')
             elif field in ['purchase_date']:
-                normalized[field] = df[col].apply(self._parse_date)
-            elif field in ['quantity', 'cost_basis', 'cost_per_unit', 'current_value', 'current_price']:
-                normalized[field] = df[col].apply(self._parse_number)
+                normalized[field] = self._parse_date_series(df[col])
+            elif field in self.INVESTMENT_NUMERIC_FIELDS:
+                normalized[field] = self._downcast_series(self._parse_number_series(df[col]), integer=field == 'quantity')
             else:
                 normalized[field] = df[col]
 
         # Fill defaults
-        if 'currency' not in normalized.columns:
-            normalized['currency'] = 'CAD'
-        if 'entity' not in normalized.columns:
-            normalized['entity'] = 'HoldCo'
-        if 'asset_class' not in normalized.columns:
-            normalized['asset_class'] = 'Public Equities'
+        normalized.setdefault('currency', 'CAD')
+        normalized.setdefault('entity', 'HoldCo')
+        normalized.setdefault('asset_class', 'Public Equities')
+
+        return self._to_frame(normalized, df.index)
+
+    def preview_investments(self, file_path: Union[str, pd.DataFrame]) -> Tuple[pd.DataFrame, List[str]]:
+        """
+        Preview investments from a CSV/Excel file.
+
+        Returns:
+            Tuple of (normalized dataframe, list of issues)
+        """
+        self.errors = []
+        self.warnings = []
+        self._row_errors = []
+
+        # Find columns from the header, then read only those
+        column_map = self._map_investment_columns(self._read_header(file_path))
+
+        if self.errors:
+            return pd.DataFrame(), self.errors
+
+        df = self._read_file(file_path, usecols=list(column_map.values()),
+                             dtype=self._text_dtypes(column_map, self.INVESTMENT_NUMERIC_FIELDS))
+        normalized = self._normalize_investments(df, column_map)
+
+        self._remember_preview(self._file_key('investments', file_path), normalized)
 
         return normalized, self.warnings
 
-    def import_investments(self, file_path: str, session=None) -> Dict:
+    def import_investments(self, file_path: Union[str, pd.DataFrame], session=None) -> Dict:
         """
         Import investments from CSV/Excel file.
 
+        CSV files are read and committed IMPORT_CHUNK_SIZE rows at a time,
+        so memory stays bounded for very large files.
+
         Returns:
             Import results with counts and errors
         """
@@ -234,72 +515,100 @@ class CSVImporter:
             session = get_session()
             close_session = True
 
-        df, issues = self.preview_investments(file_path)
+        self.errors = []
+        self.warnings = []
+        self._row_errors = []
 
-        if self.errors:
-            return {'success': False, 'errors': self.errors, 'imported': 0}
+        # Reuse the preview of this exact file if there is one, otherwise stream it
+        cached = self._preview_cache.pop(self._file_key('investments', file_path), None)
+        if cached is not None:
+            frames = [cached]
+        else:
+            column_map = self._map_investment_columns(self._read_header(file_path))
+
+            if self.errors:
+                return {'success': False, 'errors': self.errors, 'imported': 0}
+
+            frames = (
+                self._normalize_investments(chunk, column_map)
+                for chunk in self._iter_chunks(file_path, usecols=list(column_map.values()),
+                                               dtype=self._text_dtypes(column_map, self.INVESTMENT_NUMERIC_FIELDS))
+            )
 
         # Get entities
-        entities = {e.name: e.id for e in get_all_entities(session)}
+        entities = _entity_map(session)
+        holdco_id = entities.get('HoldCo')
+        unknown_entities = set()
 
         imported = 0
         skipped = 0
+        # Symbols already in the database or queued from earlier rows
+        seen_symbols = set()
 
         try:
-            for idx, row in df.iterrows():
-                try:
-                    # Get or create entity
-                    entity_name = row.get('entity', 'HoldCo')
-                    if entity_name not in entities:
-                        self.warnings.append(f"Row {idx+1}: Unknown entity '{entity_name}', using HoldCo")
-                        entity_name = 'HoldCo'
-
-                    entity_id = entities.get(entity_name, entities.get('HoldCo'))
-
-                    # Check for existing investment by symbol
-                    symbol = row.get('symbol')
-                    if symbol:
-                        existing = get_investment_by_symbol(session, symbol)
-                        if existing:
-                            self.warnings.append(f"Row {idx+1}: Investment with symbol '{symbol}' already exists, skipping")
-                            skipped += 1
-                            continue
-
-                    # Create investment
-                    investment = Investment(
-                        name=row['name'],
-                        symbol=row.get('symbol'),
-                        asset_class=row.get('asset_class', 'Public Equities'),
-                        entity_id=entity_id,
-                        currency=row.get('currency', 'CAD'),
-                        exchange=row.get('exchange'),
-                        quantity=row.get('quantity', 0),
-                        cost_basis=row.get('cost_basis', 0),
-                        cost_per_unit=row.get('cost_per_unit', 0),
-                        current_value=row.get('current_value', row.get('cost_basis', 0)),
-                        current_price=row.get('current_price', row.get('cost_per_unit', 0)),
-                        purchase_date=row.get('purchase_date'),
-                        notes=row.get('notes'),
-                        data_source='import'
+            for df in frames:
+                self._warn_unknown_entities(df, entities, unknown_entities)
+
+                # Existing symbols in a few batched queries per chunk instead of one lookup per row
+                symbols = set(df['symbol'].dropna()) - seen_symbols if 'symbol' in df.columns else set()
+                for batch in in_batches(symbols):
+                    seen_symbols.update(
+                        row.symbol for row in session.query(Investment.symbol).filter(Investment.symbol.in_(batch))
                     )
 
-                    session.add(investment)
-                    imported += 1
-
-                except Exception as e:
-                    self.errors.append(f"Row {idx+1}: {str(e)}")
-
-            session.commit()
+                to_insert = []
+                for row in df.itertuples():
+                    idx = row.Index
+                    try:
+                        # Check for existing investment by symbol before doing any other work
+                        symbol = getattr(row, 'symbol', None)
+                        if pd.isna(symbol):
+                            symbol = None
+                        if symbol:
+                            if symbol in seen_symbols:
+                                self.warnings.append(f"Row {idx+1}: Investment with symbol '{symbol}' already exists, skipping")
+                                skipped += 1
+                                continue
+                            seen_symbols.add(symbol)
+
+                        entity_id = entities.get(getattr(row, 'entity', 'HoldCo'), holdco_id)
+
+                        # Queue investment for a single bulk insert
+                        to_insert.append({
+                            'name': row.name,
+                            'symbol': symbol,
+                            'asset_class': getattr(row, 'asset_class', 'Public Equities'),
+                            'entity_id': entity_id,
+                            'currency': getattr(row, 'currency', 'CAD'),
+                            'exchange': getattr(row, 'exchange', None),
+                            'quantity': getattr(row, 'quantity', 0),
+                            'cost_basis': getattr(row, 'cost_basis', 0),
+                            'cost_per_unit': getattr(row, 'cost_per_unit', 0),
+                            'current_value': getattr(row, 'current_value', getattr(row, 'cost_basis', 0)),
+                            'current_price': getattr(row, 'current_price', getattr(row, 'cost_per_unit', 0)),
+                            'purchase_date': getattr(row, 'purchase_date', None),
+                            'notes': getattr(row, 'notes', None),
+                            'data_source': 'import'
+                        })
+
+                    except (ValueError, KeyError, TypeError, AttributeError) as e:
+                        self._row_errors.append((idx, e))
+
+                session.bulk_insert_mappings(Investment, to_insert)
+                session.commit()
+                imported += len(to_insert)
 
         except Exception as e:
             session.rollback()
+            self._flush_row_errors()
             self.errors.append(f"Import failed: {str(e)}")
-            return {'success': False, 'errors': self.errors, 'imported': 0}
+            return {'success': False, 'errors': self.errors, 'imported': imported}
 
         finally:
             if close_session:
                 session.close()
 
+        self._flush_row_errors()
         return {
             'success': True,
             'imported': imported,
@@ -308,7 +617,7 @@ class CSVImporter:
             'errors': self.errors
         }
 
-    def sync_investments(self, file_path: str, session=None) -> Dict:
+    def sync_investments(self, file_path: Union[str, pd.DataFrame], session=None) -> Dict:
         """
         Sync investments from CSV/Excel file using upsert logic.
         Matches existing investments by symbol (or name+entity) and updates them
@@ -327,83 +636,103 @@ class CSVImporter:
         if self.errors:
             return {'success': False, 'errors': self.errors, 'created': 0, 'updated': 0}
 
-        entities = {e.name: e.id for e in get_all_entities(session)}
+        entities = _entity_map(session)
+        holdco_id = entities.get('HoldCo')
+        self._warn_unknown_entities(df, entities, set())
+
+        # Load the candidate matches in a few batched queries instead of up to two per row;
+        # each value falls in one batch, so ordering by id still keeps its first match.
+        # Each match is a column dict: {'id': ...} plus pending changes for an
+        # existing investment, or the full row for one created by this sync
+        symbols = set(df['symbol'].dropna().astype(str).str.strip()) - {''} if 'symbol' in df.columns else set()
+        names = set(df['name'].dropna()) if 'name' in df.columns else set()
+        columns = (Investment.id, Investment.symbol, Investment.name, Investment.entity_id)
+        by_symbol = {}
+        by_name_entity = {}
+        to_update = {}
+        for batch in in_batches(symbols):
+            for investment in session.query(*columns).filter(Investment.symbol.in_(batch)).order_by(Investment.id):
+                by_symbol.setdefault(investment.symbol, to_update.setdefault(investment.id, {'id': investment.id}))
+        for batch in in_batches(names):
+            for investment in session.query(*columns).filter(Investment.name.in_(batch)).order_by(Investment.id):
+                by_name_entity.setdefault(
+                    (investment.name, investment.entity_id), to_update.setdefault(investment.id, {'id': investment.id})
+                )
+        to_insert = []
+
+        # Which update fields each row actually provides, as one mask per column
+        update_fields = [
+            field for field in self.INVESTMENT_NUMERIC_FIELDS + ('asset_class', 'currency', 'exchange', 'notes', 'purchase_date')
+            if field in df.columns
+        ]
+        provided = {field: (df[field].notna() & (df[field] != '')).to_numpy() for field in update_fields}
 
         created = 0
         updated = 0
 
         try:
-            for idx, row in df.iterrows():
+            for pos, row in enumerate(df.itertuples()):
+                idx = row.Index
                 try:
-                    entity_name = row.get('entity', 'HoldCo')
-                    if entity_name not in entities:
-                        self.warnings.append(f"Row {idx+1}: Unknown entity '{entity_name}', using HoldCo")
-                        entity_name = 'HoldCo'
-
-                    entity_id = entities.get(entity_name, entities.get('HoldCo'))
+                    entity_id = entities.get(getattr(row, 'entity', 'HoldCo'), holdco_id)
 
                     # Try to find existing investment by symbol first, then by name+entity
                     existing = None
-                    symbol = row.get('symbol')
+                    symbol = getattr(row, 'symbol', None)
                     if symbol and pd.notna(symbol) and str(symbol).strip():
-                        existing = get_investment_by_symbol(session, str(symbol).strip())
+                        existing = by_symbol.get(str(symbol).strip())
 
                     if existing is None:
-                        name = row.get('name', '')
-                        existing = session.query(Investment).filter(
-                            Investment.name == name,
-                            Investment.entity_id == entity_id
-                        ).first()
-
-                    if existing:
-                        # Update existing investment
-                        for field in ['quantity', 'cost_basis', 'cost_per_unit', 'current_value', 'current_price']:
-                            val = row.get(field)
-                            if val is not None and not (isinstance(val, float) and pd.isna(val)):
-                                setattr(existing, field, val)
-
-                        if row.get('asset_class'):
-                            existing.asset_class = row['asset_class']
-                        if row.get('currency'):
-                            existing.currency = row['currency']
-                        if row.get('exchange') and pd.notna(row.get('exchange')):
-                            existing.exchange = row['exchange']
-                        if row.get('notes') and pd.notna(row.get('notes')):
-                            existing.notes = row['notes']
-                        if row.get('purchase_date') and pd.notna(row.get('purchase_date')):
-                            existing.purchase_date = row['purchase_date']
-
-                        existing.data_source = 'google_sheets'
-                        existing.updated_at = datetime.utcnow()
+                        existing = by_name_entity.get((getattr(row, 'name', ''), entity_id))
+
+                    if existing is not None:
+                        # Update existing investment with the fields this row provides
+                        for field in update_fields:
+                            if provided[field][pos]:
+                                existing[field] = getattr(row, field)
+
+                        existing['data_source'] = 'google_sheets'
+                        existing['updated_at'] = datetime.utcnow()
                         updated += 1
                     else:
-                        # Create new investment
-                        investment = Investment(
-                            name=row['name'],
-                            symbol=row.get('symbol') if pd.notna(row.get('symbol', None)) else None,
-                            asset_class=row.get('asset_class', 'Public Equities'),
-                            entity_id=entity_id,
-                            currency=row.get('currency', 'CAD'),
-                            exchange=row.get('exchange') if pd.notna(row.get('exchange', None)) else None,
-                            quantity=row.get('quantity', 0),
-                            cost_basis=row.get('cost_basis', 0),
-                            cost_per_unit=row.get('cost_per_unit', 0),
-                            current_value=row.get('current_value', row.get('cost_basis', 0)),
-                            current_price=row.get('current_price', row.get('cost_per_unit', 0)),
-                            purchase_date=row.get('purchase_date'),
-                            notes=row.get('notes') if pd.notna(row.get('notes', None)) else None,
-                            data_source='google_sheets'
-                        )
-                        session.add(investment)
+                        # Queue new investment for a single bulk insert
+                        investment = {
+                            'name': row.name,
+                            'symbol': symbol if pd.notna(symbol) else None,
+                            'asset_class': getattr(row, 'asset_class', 'Public Equities'),
+                            'entity_id': entity_id,
+                            'currency': getattr(row, 'currency', 'CAD'),
+                            'exchange': getattr(row, 'exchange', None) if pd.notna(getattr(row, 'exchange', None)) else None,
+                            'quantity': getattr(row, 'quantity', 0),
+                            'cost_basis': getattr(row, 'cost_basis', 0),
+                            'cost_per_unit': getattr(row, 'cost_per_unit', 0),
+                            'current_value': getattr(row, 'current_value', getattr(row, 'cost_basis', 0)),
+                            'current_price': getattr(row, 'current_price', getattr(row, 'cost_per_unit', 0)),
+                            'purchase_date': getattr(row, 'purchase_date', None),
+                            'notes': getattr(row, 'notes', None) if pd.notna(getattr(row, 'notes', None)) else None,
+                            'data_source': 'google_sheets'
+                        }
+                        to_insert.append(investment)
                         created += 1
 
-                except Exception as e:
-                    self.errors.append(f"Row {idx+1}: {str(e)}")
+                        # Later rows for the same holding update this one
+                        if investment['symbol']:
+                            by_symbol.setdefault(investment['symbol'], investment)
+                        by_name_entity.setdefault((investment['name'], entity_id), investment)
 
+                except (ValueError, KeyError, TypeError, AttributeError) as e:
+                    self._row_errors.append((idx, e))
+
+            # One executemany per statement shape instead of a flush per object
+            changed = [values for values in to_update.values() if len(values) > 1]
+            if changed:
+                session.execute(update(Investment), changed)
+            session.bulk_insert_mappings(Investment, to_insert)
             session.commit()
 
         except Exception as e:
             session.rollback()
+            self._flush_row_errors()
             self.errors.append(f"Sync failed: {str(e)}")
             return {'success': False, 'errors': self.errors, 'created': 0, 'updated': 0}
 
@@ -411,6 +740,7 @@ class CSVImporter:
             if close_session:
                 session.close()
 
+        self._flush_row_errors()
         return {
             'success': True,
             'created': created,
@@ -419,23 +749,9 @@ class CSVImporter:
             'errors': self.errors
         }
 
-    def preview_transactions(self, file_path: str) -> Tuple[pd.DataFrame, List[str]]:
-        """Preview transactions from a CSV/Excel file."""
-        self.errors = []
-        self.warnings = []
-
-        # Read file
-        if file_path.endswith('.xlsx') or file_path.endswith('.xls'):
-            df = pd.read_excel(file_path)
-        else:
-            df = pd.read_csv(file_path)
-
-        # Find columns
-        column_map = {}
-        for field in self.TRANSACTION_COLUMNS.keys():
-            col = self._find_column(df, field, self.TRANSACTION_COLUMNS)
-            if col:
-                column_map[field] = col
+    def _map_transaction_columns(self, columns) -> Dict[str, str]:
+        """Map transaction fields to file columns, recording missing required ones in self.errors."""
+        column_map = self._build_column_map(columns, self.TRANSACTION_COLUMNS)
 
         # Check required columns
         if 'date' not in column_map:
@@ -443,102 +759,159 @@ class CSVImporter:
         if 'investment_name' not in column_map and 'symbol' not in column_map:
             self.errors.append("Required column 'investment_name' or 'symbol' not found")
 
-        if self.errors:
-            return pd.DataFrame(), self.errors
+        return column_map
 
-        # Build normalized dataframe
-        normalized = pd.DataFrame()
+    def _normalize_transactions(self, df: pd.DataFrame, column_map: Dict[str, str]) -> pd.DataFrame:
+        """Build the normalized transactions dataframe for a file or chunk."""
+        normalized = {}
 
         for field, col in column_map.items():
             if field == 'type':
-                normalized[field] = df[col].apply(self._normalize_transaction_type)
+                normalized[field] = self._normalize_series(df[col], self.TRANSACTION_TYPE_MAPPING, 'Buy')
             elif field == 'date':
-                normalized[field] = df[col].apply(self._parse_date)
-            elif field in ['quantity', 'price', 'amount', 'fees']:
-                normalized[field] = df[col].apply(self._parse_number)
+                normalized[field] = self._parse_date_series(df[col])
+            elif field in self.TRANSACTION_NUMERIC_FIELDS:
+                normalized[field] = self._downcast_series(self._parse_number_series(df[col]), integer=field == 'quantity')
             else:
                 normalized[field] = df[col]
 
         # Fill defaults
-        if 'currency' not in normalized.columns:
-            normalized['currency'] = 'CAD'
-        if 'type' not in normalized.columns:
-            normalized['type'] = 'Buy'
+        normalized.setdefault('currency', 'CAD')
+        normalized.setdefault('type', 'Buy')
+
+        return self._to_frame(normalized, df.index)
+
+    def preview_transactions(self, file_path: Union[str, pd.DataFrame]) -> Tuple[pd.DataFrame, List[str]]:
+        """Preview transactions from a CSV/Excel file."""
+        self.errors = []
+        self.warnings = []
+        self._row_errors = []
+
+        # Find columns from the header, then read only those
+        column_map = self._map_transaction_columns(self._read_header(file_path))
+
+        if self.errors:
+            return pd.DataFrame(), self.errors
+
+        df = self._read_file(file_path, usecols=list(column_map.values()),
+                             dtype=self._text_dtypes(column_map, self.TRANSACTION_NUMERIC_FIELDS))
+        normalized = self._normalize_transactions(df, column_map)
+
+        self._remember_preview(self._file_key('transactions', file_path), normalized)
 
         return normalized, self.warnings
 
-    def import_transactions(self, file_path: str, session=None) -> Dict:
-        """Import transactions from CSV/Excel file."""
+    def import_transactions(self, file_path: Union[str, pd.DataFrame], session=None) -> Dict:
+        """
+        Import transactions from CSV/Excel file.
+
+        CSV files are read and committed IMPORT_CHUNK_SIZE rows at a time.
+        """
         close_session = False
         if session is None:
             session = get_session()
             close_session = True
 
-        df, issues = self.preview_transactions(file_path)
+        self.errors = []
+        self.warnings = []
+        self._row_errors = []
 
-        if self.errors:
-            return {'success': False, 'errors': self.errors, 'imported': 0}
+        # Reuse the preview of this exact file if there is one, otherwise stream it
+        cached = self._preview_cache.pop(self._file_key('transactions', file_path), None)
+        if cached is not None:
+            frames = [cached]
+        else:
+            column_map = self._map_transaction_columns(self._read_header(file_path))
 
-        imported = 0
+            if self.errors:
+                return {'success': False, 'errors': self.errors, 'imported': 0}
 
-        try:
-            for idx, row in df.iterrows():
-                try:
-                    # Find investment
-                    investment = None
-                    if row.get('symbol'):
-                        investment = get_investment_by_symbol(session, row['symbol'])
-
-                    if not investment and row.get('investment_name'):
-                        investment = session.query(Investment).filter(
-                            Investment.name.ilike(f"%{row['investment_name']}%")
-                        ).first()
-
-                    if not investment:
-                        self.warnings.append(f"Row {idx+1}: Investment not found, skipping")
-                        continue
-
-                    # Calculate amount if not provided
-                    amount = row.get('amount', 0)
-                    if amount == 0 and row.get('quantity') and row.get('price'):
-                        amount = row['quantity'] * row['price']
-
-                    # Create transaction
-                    transaction = Transaction(
-                        investment_id=investment.id,
-                        transaction_type=row.get('type', 'Buy'),
-                        date=row['date'],
-                        quantity=row.get('quantity', 0),
-                        price_per_unit=row.get('price', 0),
-                        total_amount=amount,
-                        currency=row.get('currency', 'CAD'),
-                        fees=row.get('fees', 0),
-                        notes=row.get('notes')
-                    )
+            frames = (
+                self._normalize_transactions(chunk, column_map)
+                for chunk in self._iter_chunks(file_path, usecols=list(column_map.values()),
+                                               dtype=self._text_dtypes(column_map, self.TRANSACTION_NUMERIC_FIELDS))
+            )
+
+        imported = 0
 
-                    session.add(transaction)
-                    imported += 1
+        # Load investment lookups once instead of querying per row;
+        # by_name memoizes the name match for each distinct name in the file
+        by_symbol = {}
+        by_name = {}
+        names_folded = []
+        for investment in session.query(Investment.id, Investment.symbol, Investment.name).order_by(Investment.id):
+            if investment.symbol:
+                by_symbol.setdefault(investment.symbol, investment)
+            names_folded.append(((investment.name or '').casefold(), investment))
 
-                except Exception as e:
-                    self.errors.append(f"Row {idx+1}: {str(e)}")
+        touched_ids = set()
 
-            session.commit()
+        try:
+            for df in frames:
+                to_insert = []
+                for row in df.itertuples():
+                    idx = row.Index
+                    try:
+                        # Find investment
+                        investment = None
+                        symbol = getattr(row, 'symbol', None)
+                        if pd.notna(symbol) and symbol:
+                            investment = by_symbol.get(symbol)
+
+                        investment_name = getattr(row, 'investment_name', None)
+                        if not investment and pd.notna(investment_name) and investment_name:
+                            needle = str(investment_name).casefold()
+                            if needle not in by_name:
+                                # First investment by id whose name contains this one, like the
+                                # old ILIKE '%name%' ... .first(); an exact match gets no priority
+                                by_name[needle] = next((inv for name, inv in names_folded if needle in name), None)
+                            investment = by_name[needle]
+
+                        if not investment:
+                            self.warnings.append(f"Row {idx+1}: Investment not found, skipping")
+                            continue
 
-            # Update investment positions
-            from .database import update_investment_position
-            investments = session.query(Investment).all()
-            for inv in investments:
-                update_investment_position(session, inv.id)
+                        # Calculate amount if not provided
+                        amount = getattr(row, 'amount', 0)
+                        if amount == 0 and getattr(row, 'quantity', None) and getattr(row, 'price', None):
+                            amount = row.quantity * row.price
+
+                        # Queue transaction for a single bulk insert
+                        to_insert.append({
+                            'investment_id': investment.id,
+                            'transaction_type': getattr(row, 'type', 'Buy'),
+                            'date': row.date,
+                            'quantity': getattr(row, 'quantity', 0),
+                            'price_per_unit': getattr(row, 'price', 0),
+                            'total_amount': amount,
+                            'currency': getattr(row, 'currency', 'CAD'),
+                            'fees': getattr(row, 'fees', 0),
+                            'notes': getattr(row, 'notes', None)
+                        })
+                        touched_ids.add(investment.id)
+
+                    except (ValueError, KeyError, TypeError, AttributeError) as e:
+                        self._row_errors.append((idx, e))
+
+                session.bulk_insert_mappings(Transaction, to_insert)
+                session.commit()
+                imported += len(to_insert)
+
+            # Update positions only for investments that received transactions
+            from .database import update_investment_position_bulk
+            update_investment_position_bulk(session, touched_ids)
 
         except Exception as e:
             session.rollback()
+            self._flush_row_errors()
             self.errors.append(f"Import failed: {str(e)}")
-            return {'success': False, 'errors': self.errors, 'imported': 0}
+            return {'success': False, 'errors': self.errors, 'imported': imported}
 
         finally:
             if close_session:
                 session.close()
 
+        self._flush_row_errors()
         return {
             'success': True,
             'imported': imported,
@@ -547,12 +920,29 @@ class CSVImporter:
         }
 
 
+# The inputs are a handful of repeated labels, so memoize the normalization
+@lru_cache(maxsize=256)
+def _norm_asset(value: str) -> str:
+    if not value:
+        return 'Public Equities'
+    return CSVImporter.ASSET_CLASS_MAPPING.get(value.lower().strip(), value)
+
+
+@lru_cache(maxsize=256)
+def _norm_transaction_type(value: str) -> str:
+    if not value:
+        return 'Buy'
+    return CSVImporter.TRANSACTION_TYPE_MAPPING.get(value.lower().strip(), value)
+
+
 class GoogleSheetsImporter:
     """Import data from Google Sheets."""
 
     def __init__(self, credentials_path: str = None):
         self.credentials_path = credentials_path
         self.client = None
+        # One CSV importer for every call; each run resets its own errors and warnings
+        self._csv_importer = CSVImporter()
 
     def connect(self) -> bool:
         """Connect to Google Sheets API."""
@@ -599,6 +989,14 @@ class GoogleSheetsImporter:
             print(f"Error reading sheet: {e}")
             return None
 
+    @staticmethod
+    def _blank_to_nan(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        get_all_records() returns '' for empty cells; treat them as missing,
+        as reading them back from a CSV would.
+        """
+        return df.replace('', np.nan)
+
     def import_from_sheet(self, sheet_url: str, import_type: str = 'investments', worksheet_name: str = None, session=None) -> Dict:
         """
         Import investments or transactions from Google Sheet.
@@ -613,16 +1011,13 @@ class GoogleSheetsImporter:
         if df is None:
             return {'success': False, 'errors': ['Failed to read Google Sheet'], 'imported': 0}
 
-        # Save to temp CSV and use CSV importer
-        temp_path = '/tmp/gsheet_import.csv'
-        df.to_csv(temp_path, index=False)
-
-        importer = CSVImporter()
+        # Hand the sheet straight to the CSV importer
+        df = self._blank_to_nan(df)
 
         if import_type == 'investments':
-            return importer.import_investments(temp_path, session)
+            return self._csv_importer.import_investments(df, session)
         else:
-            return importer.import_transactions(temp_path, session)
+            return self._csv_importer.import_transactions(df, session)
 
     def sync_from_sheet(self, sheet_url: str = None, worksheet_name: str = None, session=None) -> Dict:
         """
@@ -665,12 +1060,9 @@ class GoogleSheetsImporter:
         if df is None:
             return {'success': False, 'errors': ['Failed to read Google Sheet'], 'created': 0, 'updated': 0}
 
-        # Save to temp CSV and delegate to sync_investments
-        temp_path = '/tmp/gsheet_sync.csv'
-        df.to_csv(temp_path, index=False)
-
-        importer = CSVImporter()
-        result = importer.sync_investments(temp_path, session)
+        # Delegate to sync_investments without a temp file
+        df = self._blank_to_nan(df)
+        result = self._csv_importer.sync_investments(df, session)
 
         # Update last_sync_time in config on success
         if result.get('success'):
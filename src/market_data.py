@@ -5,37 +5,176 @@ Fetches prices from Yahoo Finance, Kraken, and FX providers.
 
 import yfinance as yf
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date, timedelta
 from typing import Optional, Dict, List, Tuple
 import pandas as pd
 from functools import lru_cache
+from threading import RLock
+from types import MappingProxyType
+from weakref import WeakValueDictionary
+import logging
+import os
 import time
 
+try:
+    import requests_cache
+    REQUESTS_CACHE_AVAILABLE = True
+except ImportError:
+    REQUESTS_CACHE_AVAILABLE = False
+
+try:
+    from cachetools import TTLCache
+    CACHETOOLS_AVAILABLE = True
+except ImportError:
+    CACHETOOLS_AVAILABLE = False
+
+    class TTLCache:
+        """Fallback when cachetools is not installed: the subset of TTLCache used here."""
+
+        def __init__(self, maxsize: int, ttl: float):
+            self.maxsize = maxsize
+            self.ttl = ttl
+            self._data = {}
+
+        def get(self, key, default=None):
+            entry = self._data.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                return default
+            return entry[0]
+
+        def __setitem__(self, key, value):
+            if key not in self._data and len(self._data) >= self.maxsize:
+                # Evict the oldest insertion to stay bounded
+                del self._data[next(iter(self._data))]
+            self._data[key] = (value, time.monotonic() + self.ttl)
+
+        def clear(self):
+            self._data.clear()
+
+
+logger = logging.getLogger(__name__)
+
+# SQLite file backing the HTTP response cache, shared across restarts and workers
+HTTP_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'market_cache')
+
+# Kraken uses different pair formats
+_KRAKEN_PAIRS = MappingProxyType({
+    'BTC': 'XXBTZUSD',
+    'ETH': 'XETHZUSD',
+    'XRP': 'XXRPZUSD',
+    'LTC': 'XLTCZUSD',
+    'DOT': 'DOTUSD',
+    'ADA': 'ADAUSD',
+    'SOL': 'SOLUSD',
+    'DOGE': 'XDGUSD',
+    'LINK': 'LINKUSD',
+    'MATIC': 'MATICUSD',
+    'AVAX': 'AVAXUSD',
+    'UNI': 'UNIUSD',
+})
+
+# CoinGecko ID mapping
+_COINGECKO_IDS = MappingProxyType({
+    'BTC': 'bitcoin',
+    'ETH': 'ethereum',
+    'XRP': 'ripple',
+    'LTC': 'litecoin',
+    'DOT': 'polkadot',
+    'ADA': 'cardano',
+    'SOL': 'solana',
+    'DOGE': 'dogecoin',
+    'LINK': 'chainlink',
+    'MATIC': 'matic-network',
+    'AVAX': 'avalanche-2',
+    'UNI': 'uniswap',
+})
+
 
 class MarketDataProvider:
     """Unified market data provider"""
 
-    def __init__(self):
-        self.cache_timeout = 900  # 15 minutes
-        self._cache = {}
-        self._cache_timestamps = {}
+    # Concurrent quote requests for the *_parallel methods
+    MAX_WORKERS = 10
 
-    def _is_cache_valid(self, key: str) -> bool:
-        """Check if cached data is still valid"""
-        if key not in self._cache_timestamps:
-            return False
-        return (time.time() - self._cache_timestamps[key]) < self.cache_timeout
+    # Symbols per yf.download request in get_stock_prices_bulk
+    YAHOO_BATCH_SIZE = 20
 
-    def _set_cache(self, key: str, value):
-        """Set cache value"""
-        self._cache[key] = value
-        self._cache_timestamps[key] = time.time()
+    # Stock quotes go stale quickly but come from a cheap endpoint; the
+    # name/PE/market-cap metadata comes from the slow .info scrape and barely changes
+    QUOTE_TIMEOUT = 60
+    METADATA_TIMEOUT = 86400
 
-    def _get_cache(self, key: str):
+    def __init__(self):
+        self.cache_timeout = 900  # 15 minutes
+        # Bounded and self-expiring; the lock makes it safe to share across threads
+        self._cache = TTLCache(maxsize=1024, ttl=self.cache_timeout)
+        self._quote_cache = TTLCache(maxsize=1024, ttl=self.QUOTE_TIMEOUT)
+        self._meta_cache = TTLCache(maxsize=1024, ttl=self.METADATA_TIMEOUT)
+        self._lock = RLock()
+        self._executor = None
+        self._tickers = WeakValueDictionary()
+        self._http = None
+
+    @staticmethod
+    def _create_http_session(expire_after: int) -> requests.Session:
+        """
+        Keep-alive session for the Kraken/CoinGecko REST calls, so repeat
+        requests skip the TCP/TLS handshake, with retries on rate limits and
+        transient server errors. With requests-cache installed, HTTP 200
+        responses are also kept on disk for expire_after seconds, so a
+        restarted app starts with a warm cache; expired ones are pruned here,
+        which keeps the file to roughly one expiry window of responses.
+        """
+        if REQUESTS_CACHE_AVAILABLE:
+            session = requests_cache.CachedSession(HTTP_CACHE_PATH, backend='sqlite',
+                                                   expire_after=expire_after, allowable_codes=(200,))
+            session.cache.delete(expired=True, vacuum=False)
+        else:
+            session = requests.Session()
+        retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=retry))
+        session.headers['User-Agent'] = 'Investment-Register/1.0'
+        return session
+
+    def _get_http(self) -> requests.Session:
+        """HTTP session, created on first use so importing this module touches no files"""
+        with self._lock:
+            if self._http is None:
+                self._http = self._create_http_session(self.cache_timeout)
+            return self._http
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Thread pool for I/O-bound fan-out, created on first use and then reused"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.MAX_WORKERS, thread_name_prefix='market_data')
+            return self._executor
+
+    def _ticker(self, symbol: str) -> yf.Ticker:
+        """
+        Shared yf.Ticker for a symbol while any caller still holds it. Weak
+        references on purpose: a Ticker memoizes its fast_info quote, so
+        keeping one alive indefinitely would serve stale prices.
+        """
+        with self._lock:
+            ticker = self._tickers.get(symbol)
+            if ticker is None:
+                ticker = yf.Ticker(symbol)
+                self._tickers[symbol] = ticker
+            return ticker
+
+    def _set_cache(self, key: str, value, cache: TTLCache = None):
+        """Set cache value (in the general cache unless another is given)"""
+        with self._lock:
+            (self._cache if cache is None else cache)[key] = value
+
+    def _get_cache(self, key: str, cache: TTLCache = None):
         """Get cache value if valid"""
-        if self._is_cache_valid(key):
-            return self._cache.get(key)
-        return None
+        with self._lock:
+            return (self._cache if cache is None else cache).get(key)
 
     # =========================================================================
     # Yahoo Finance - Stocks and ETFs
@@ -48,8 +187,9 @@ class MarketDataProvider:
         For TSX stocks, append .TO (e.g., RY.TO for Royal Bank)
         For TSX Venture, append .V
         """
-        cache_key = f"stock_{symbol}"
-        cached = self._get_cache(cache_key)
+        # Keyed by listing, so e.g. ENB on the TSX and the NYSE don't collide
+        cache_key = f"stock_{symbol}_{exchange}"
+        cached = self._get_cache(cache_key, self._quote_cache)
         if cached:
             return cached
 
@@ -57,76 +197,110 @@ class MarketDataProvider:
             # Adjust symbol for Canadian exchanges
             yahoo_symbol = self._get_yahoo_symbol(symbol, exchange)
 
-            ticker = yf.Ticker(yahoo_symbol)
-            info = ticker.info
+            ticker = self._ticker(yahoo_symbol)
 
-            # Get current price
-            price = info.get('regularMarketPrice') or info.get('currentPrice') or info.get('previousClose')
-
-            if price is None:
-                # Try to get from history
-                hist = ticker.history(period='1d')
-                if not hist.empty:
-                    price = hist['Close'].iloc[-1]
+            # Get current price from the quote endpoint
+            price = self._get_last_price(ticker)
 
             if price is None:
                 return None
 
+            fast = ticker.fast_info
+            meta = self._get_stock_metadata(ticker, yahoo_symbol, symbol)
+            previous_close = self._fast_info_value(fast, 'previous_close', price)
+            change = price - previous_close
+
             result = {
                 'symbol': symbol,
                 'yahoo_symbol': yahoo_symbol,
                 'price': float(price),
-                'currency': info.get('currency', 'USD'),
-                'name': info.get('longName') or info.get('shortName', symbol),
-                'change': info.get('regularMarketChange', 0),
-                'change_pct': info.get('regularMarketChangePercent', 0),
-                'previous_close': info.get('previousClose', price),
-                'open': info.get('regularMarketOpen', price),
-                'high': info.get('regularMarketDayHigh', price),
-                'low': info.get('regularMarketDayLow', price),
-                'volume': info.get('regularMarketVolume', 0),
-                'market_cap': info.get('marketCap', 0),
-                'pe_ratio': info.get('trailingPE'),
-                'dividend_yield': info.get('dividendYield'),
+                'currency': self._fast_info_value(fast, 'currency', None) or meta['currency'],
+                'name': meta['name'],
+                'change': change,
+                'change_pct': (change / previous_close * 100) if previous_close else 0,
+                'previous_close': previous_close,
+                'open': self._fast_info_value(fast, 'open', price),
+                'high': self._fast_info_value(fast, 'day_high', price),
+                'low': self._fast_info_value(fast, 'day_low', price),
+                'volume': self._fast_info_value(fast, 'last_volume', 0),
+                'market_cap': meta['market_cap'],
+                'pe_ratio': meta['pe_ratio'],
+                'dividend_yield': meta['dividend_yield'],
                 'timestamp': datetime.now()
             }
 
-            self._set_cache(cache_key, result)
+            self._set_cache(cache_key, result, self._quote_cache)
             return result
 
         except Exception as e:
-            print(f"Error fetching stock price for {symbol}: {e}")
+            logger.warning("Error fetching stock price for %s: %s", symbol, e)
             return None
 
+    def _get_stock_metadata(self, ticker, yahoo_symbol: str, symbol: str) -> Dict:
+        """Name, currency and fundamentals from Ticker.info, cached for METADATA_TIMEOUT"""
+        cache_key = f"meta_{yahoo_symbol}"
+        meta = self._get_cache(cache_key, self._meta_cache)
+        if meta:
+            return meta
+
+        try:
+            info = ticker.info
+        except Exception as e:
+            logger.warning("Error fetching metadata for %s: %s", symbol, e)
+            info = {}
+
+        meta = {
+            'name': info.get('longName') or info.get('shortName', symbol),
+            'currency': info.get('currency', 'USD'),
+            'market_cap': info.get('marketCap', 0),
+            'pe_ratio': info.get('trailingPE'),
+            'dividend_yield': info.get('dividendYield'),
+        }
+
+        # A failed lookup is retried on the next quote rather than cached for a day
+        if info:
+            self._set_cache(cache_key, meta, self._meta_cache)
+        return meta
+
+    @staticmethod
+    def _fast_info_value(fast, name: str, default):
+        """A fast_info field, or default when Yahoo doesn't provide it"""
+        try:
+            value = getattr(fast, name)
+        except Exception:
+            return default
+        return default if value is None or pd.isna(value) else value
+
     def _get_yahoo_symbol(self, symbol: str, exchange: str = None) -> str:
         """Convert symbol to Yahoo Finance format"""
-        symbol = symbol.upper()
+        return _yahoo_symbol(symbol, exchange)
 
-        # Already has exchange suffix
-        if '.' in symbol:
-            return symbol
+    @staticmethod
+    def _get_last_price(ticker) -> Optional[float]:
+        """
+        Last price from the lightweight quote/chart endpoints, without the
+        fundamentals scrape behind Ticker.info.
+        """
+        try:
+            price = ticker.fast_info.last_price
+        except Exception:
+            price = None
 
-        # Add exchange suffix based on exchange parameter
-        if exchange:
-            exchange = exchange.upper()
-            if exchange == 'TSX':
-                return f"{symbol}.TO"
-            elif exchange == 'TSXV':
-                return f"{symbol}.V"
-            elif exchange in ['NYSE', 'NASDAQ', 'US']:
-                return symbol
+        if price is None or pd.isna(price):
+            hist = ticker.history(period='1d')
+            price = hist['Close'].iat[-1] if not hist.empty else None
 
-        return symbol
+        return price
 
     def get_stock_history(self, symbol: str, exchange: str = None, period: str = '1y') -> Optional[pd.DataFrame]:
         """Get historical stock data"""
         try:
             yahoo_symbol = self._get_yahoo_symbol(symbol, exchange)
-            ticker = yf.Ticker(yahoo_symbol)
+            ticker = self._ticker(yahoo_symbol)
             hist = ticker.history(period=period)
             return hist
         except Exception as e:
-            print(f"Error fetching history for {symbol}: {e}")
+            logger.warning("Error fetching history for %s: %s", symbol, e)
             return None
 
     def get_multiple_stock_prices(self, symbols: List[Tuple[str, str]]) -> Dict[str, Dict]:
@@ -137,39 +311,61 @@ class MarketDataProvider:
         results = {}
 
         # Convert symbols
-        yahoo_symbols = []
-        symbol_map = {}
-        for symbol, exchange in symbols:
-            yahoo_sym = self._get_yahoo_symbol(symbol, exchange)
-            yahoo_symbols.append(yahoo_sym)
-            symbol_map[yahoo_sym] = symbol
+        to_yahoo = self._get_yahoo_symbol
+        pairs = [(to_yahoo(symbol, exchange), symbol) for symbol, exchange in symbols]
+        yahoo_symbols = [yahoo_sym for yahoo_sym, _ in pairs]
+        symbol_map = dict(pairs)
 
         try:
             # Batch download
             data = yf.download(yahoo_symbols, period='1d', progress=False)
 
             if not data.empty:
+                if len(yahoo_symbols) == 1:
+                    # A Series, or a one-column frame on newer yfinance
+                    closes = {yahoo_symbols[0]: data['Close'].to_numpy().ravel()[-1]}
+                else:
+                    # Last row of the Close block, indexed by Yahoo symbol
+                    closes = data['Close'].iloc[-1]
+
+                now = datetime.now()
                 for yahoo_sym in yahoo_symbols:
                     original_sym = symbol_map[yahoo_sym]
                     try:
-                        if len(yahoo_symbols) == 1:
-                            price = data['Close'].iloc[-1]
-                        else:
-                            price = data['Close'][yahoo_sym].iloc[-1]
-
                         results[original_sym] = {
                             'symbol': original_sym,
-                            'price': float(price),
-                            'timestamp': datetime.now()
+                            'price': float(closes[yahoo_sym]),
+                            'timestamp': now
                         }
-                    except:
-                        pass
+                    except (KeyError, IndexError, ValueError, TypeError) as e:
+                        logger.debug("No batch price for %s: %s", yahoo_sym, e)
 
         except Exception as e:
-            print(f"Error in batch stock fetch: {e}")
+            logger.warning("Error in batch stock fetch: %s", e)
 
         return results
 
+    def get_stock_prices_bulk(self, symbols: List[Tuple[str, str]]) -> Dict[str, Dict]:
+        """
+        Get last prices for any number of stocks in batches of YAHOO_BATCH_SIZE,
+        one download request per batch. Same result shape as
+        get_multiple_stock_prices; use get_stock_price when the quote's
+        currency or other metadata is needed.
+        symbols: List of (symbol, exchange) tuples
+        """
+        results = {}
+        for start in range(0, len(symbols), self.YAHOO_BATCH_SIZE):
+            results.update(self.get_multiple_stock_prices(symbols[start:start + self.YAHOO_BATCH_SIZE]))
+        return results
+
+    def get_stock_prices_parallel(self, symbols: List[Tuple[str, str]]) -> Dict[str, Dict]:
+        """
+        Get full quotes for multiple stocks, fetching them concurrently.
+        symbols: List of (symbol, exchange) tuples
+        """
+        quotes = self._get_executor().map(lambda item: self.get_stock_price(*item), symbols)
+        return {symbol: quote for (symbol, _), quote in zip(symbols, quotes) if quote}
+
     # =========================================================================
     # Crypto - Kraken and fallback
     # =========================================================================
@@ -193,34 +389,23 @@ class MarketDataProvider:
 
         return result
 
+    def get_crypto_prices_parallel(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Get prices for multiple cryptocurrencies, fetching them concurrently"""
+        quotes = self._get_executor().map(self.get_crypto_price, symbols)
+        return {symbol: quote for symbol, quote in zip(symbols, quotes) if quote}
+
     def _get_kraken_price(self, symbol: str) -> Optional[Dict]:
         """Get price from Kraken public API"""
         try:
-            # Kraken uses different pair formats
-            pair_map = {
-                'BTC': 'XXBTZUSD',
-                'ETH': 'XETHZUSD',
-                'XRP': 'XXRPZUSD',
-                'LTC': 'XLTCZUSD',
-                'DOT': 'DOTUSD',
-                'ADA': 'ADAUSD',
-                'SOL': 'SOLUSD',
-                'DOGE': 'XDGUSD',
-                'LINK': 'LINKUSD',
-                'MATIC': 'MATICUSD',
-                'AVAX': 'AVAXUSD',
-                'UNI': 'UNIUSD',
-            }
-
             # Get Kraken pair name
             symbol_upper = symbol.upper()
-            pair = pair_map.get(symbol_upper, f"{symbol_upper}USD")
+            pair = _KRAKEN_PAIRS.get(symbol_upper, f"{symbol_upper}USD")
 
             url = f"https://api.kraken.com/0/public/Ticker?pair={pair}"
-            response = requests.get(url, timeout=10)
+            response = self._get_http().get(url, timeout=10)
             data = response.json()
 
-            if data.get('error') and len(data['error']) > 0:
+            if data.get('error'):
                 return None
 
             result_data = data.get('result', {})
@@ -228,7 +413,7 @@ class MarketDataProvider:
                 return None
 
             # Get the first (and usually only) pair result
-            pair_data = list(result_data.values())[0]
+            pair_data = next(iter(result_data.values()))
 
             price = float(pair_data['c'][0])  # Current price
             open_price = float(pair_data['o'])
@@ -251,32 +436,16 @@ class MarketDataProvider:
             }
 
         except Exception as e:
-            print(f"Kraken error for {symbol}: {e}")
+            logger.warning("Kraken error for %s: %s", symbol, e)
             return None
 
     def _get_coingecko_price(self, symbol: str) -> Optional[Dict]:
         """Get price from CoinGecko (fallback)"""
         try:
-            # CoinGecko ID mapping
-            id_map = {
-                'BTC': 'bitcoin',
-                'ETH': 'ethereum',
-                'XRP': 'ripple',
-                'LTC': 'litecoin',
-                'DOT': 'polkadot',
-                'ADA': 'cardano',
-                'SOL': 'solana',
-                'DOGE': 'dogecoin',
-                'LINK': 'chainlink',
-                'MATIC': 'matic-network',
-                'AVAX': 'avalanche-2',
-                'UNI': 'uniswap',
-            }
-
-            coin_id = id_map.get(symbol.upper(), symbol.lower())
+            coin_id = _COINGECKO_IDS.get(symbol.upper(), symbol.lower())
 
             url = f"https://api.coingecko.com/api/v3/simple/price?ids={coin_id}&vs_currencies=usd&include_24hr_change=true"
-            response = requests.get(url, timeout=10)
+            response = self._get_http().get(url, timeout=10)
             data = response.json()
 
             if coin_id not in data:
@@ -295,7 +464,7 @@ class MarketDataProvider:
             }
 
         except Exception as e:
-            print(f"CoinGecko error for {symbol}: {e}")
+            logger.warning("CoinGecko error for %s: %s", symbol, e)
             return None
 
     # =========================================================================
@@ -310,16 +479,11 @@ class MarketDataProvider:
             return cached
 
         try:
-            # Use Yahoo Finance GLD ETF as proxy, adjust for ETF ratio
-            ticker = yf.Ticker("GC=F")  # Gold Futures
-            info = ticker.info
-
-            price = info.get('regularMarketPrice') or info.get('previousClose')
+            price = self._get_last_price(self._ticker("GC=F"))  # Gold Futures
 
             if price is None:
                 # Fallback to GLD ETF (roughly 1/10 of gold price)
-                gld = yf.Ticker("GLD")
-                gld_price = gld.info.get('regularMarketPrice', 0)
+                gld_price = self._get_last_price(self._ticker("GLD")) or 0
                 price = gld_price * 10  # Approximate conversion
 
             result = {
@@ -335,7 +499,7 @@ class MarketDataProvider:
             return result
 
         except Exception as e:
-            print(f"Error fetching gold price: {e}")
+            logger.warning("Error fetching gold price: %s", e)
             return None
 
     # =========================================================================
@@ -355,20 +519,99 @@ class MarketDataProvider:
         try:
             # Yahoo Finance FX
             pair = f"{from_currency}{to_currency}=X"
-            ticker = yf.Ticker(pair)
-            hist = ticker.history(period='1d')
+            rate = self._get_last_price(self._ticker(pair))
 
-            if not hist.empty:
-                rate = float(hist['Close'].iloc[-1])
+            if rate is not None:
+                rate = float(rate)
                 self._set_cache(cache_key, rate)
                 return rate
 
             return None
 
         except Exception as e:
-            print(f"Error fetching FX rate {from_currency}/{to_currency}: {e}")
+            logger.warning("Error fetching FX rate %s/%s: %s", from_currency, to_currency, e)
             return None
 
+    def get_fx_rates_bulk(self, pairs: List[Tuple[str, str]]) -> Dict[Tuple[str, str], float]:
+        """
+        Get current FX rates for several currency pairs in one download request.
+        pairs: List of (from_currency, to_currency) tuples
+        Pairs Yahoo has no rate for are left out of the result.
+        """
+        results = {}
+        missing = []
+        for from_currency, to_currency in pairs:
+            if from_currency == to_currency:
+                results[(from_currency, to_currency)] = 1.0
+                continue
+            cached = self._get_cache(f"fx_{from_currency}_{to_currency}")
+            if cached:
+                results[(from_currency, to_currency)] = cached
+            else:
+                missing.append((from_currency, to_currency))
+
+        if not missing:
+            return results
+
+        try:
+            yahoo_pairs = [f"{a}{b}=X" for a, b in missing]
+            data = yf.download(yahoo_pairs, period='1d', group_by='ticker', progress=False, threads=True)
+
+            if not data.empty:
+                for (from_currency, to_currency), pair in zip(missing, yahoo_pairs):
+                    try:
+                        closes = data[pair]['Close'] if isinstance(data.columns, pd.MultiIndex) else data['Close']
+                        closes = closes.dropna()
+                        if closes.empty:
+                            continue
+                        rate = float(closes.iat[-1])
+                    except KeyError:
+                        continue
+                    self._set_cache(f"fx_{from_currency}_{to_currency}", rate)
+                    results[(from_currency, to_currency)] = rate
+
+        except Exception as e:
+            logger.warning("Error in batch FX fetch: %s", e)
+
+        return results
+
+    def get_prices(self, stock_symbols: List[Tuple[str, str]] = (), crypto_symbols: List[str] = (),
+                   fx_pairs: List[Tuple[str, str]] = (), gold: bool = False) -> Dict:
+        """
+        Fetch stock, crypto, FX and gold quotes in one concurrent batch, so a
+        full refresh takes about as long as its slowest request. A failed
+        request only leaves out its own entry.
+
+        Returns:
+            {'stocks': {(symbol, exchange): quote}, 'crypto': {symbol: quote},
+             'fx': {(from, to): rate}, 'gold': quote or None}
+        """
+        executor = self._get_executor()
+        stock_futures = {(symbol, exchange): executor.submit(self.get_stock_price, symbol, exchange)
+                         for symbol, exchange in stock_symbols}
+        crypto_futures = {symbol: executor.submit(self.get_crypto_price, symbol) for symbol in crypto_symbols}
+        fx_future = executor.submit(self.get_fx_rates_bulk, list(fx_pairs)) if fx_pairs else None
+        gold_future = executor.submit(self.get_gold_price) if gold else None
+
+        def collect(futures):
+            results = {}
+            for key, future in futures.items():
+                try:
+                    value = future.result()
+                except Exception as e:
+                    logger.warning("Error fetching %s: %s", key, e)
+                    continue
+                if value:
+                    results[key] = value
+            return results
+
+        return {
+            'stocks': collect(stock_futures),
+            'crypto': collect(crypto_futures),
+            'fx': collect({'FX': fx_future}).get('FX', {}) if fx_future else {},
+            'gold': collect({'GOLD': gold_future}).get('GOLD') if gold_future else None,
+        }
+
     def get_usd_cad_rate(self) -> float:
         """Get USD to CAD exchange rate"""
         rate = self.get_fx_rate('USD', 'CAD')
@@ -378,11 +621,11 @@ class MarketDataProvider:
         """Get historical FX rates"""
         try:
             pair = f"{from_currency}{to_currency}=X"
-            ticker = yf.Ticker(pair)
+            ticker = self._ticker(pair)
             hist = ticker.history(period=period)
             return hist
         except Exception as e:
-            print(f"Error fetching historical FX: {e}")
+            logger.warning("Error fetching historical FX: %s", e)
             return None
 
     # =========================================================================
@@ -392,11 +635,11 @@ class MarketDataProvider:
     def get_benchmark_data(self, symbol: str, period: str = '1y') -> Optional[pd.DataFrame]:
         """Get benchmark index data"""
         try:
-            ticker = yf.Ticker(symbol)
+            ticker = self._ticker(symbol)
             hist = ticker.history(period=period)
             return hist
         except Exception as e:
-            print(f"Error fetching benchmark {symbol}: {e}")
+            logger.warning("Error fetching benchmark %s: %s", symbol, e)
             return None
 
     def get_benchmark_returns(self, symbol: str, periods: List[str] = None) -> Dict[str, float]:
@@ -410,7 +653,7 @@ class MarketDataProvider:
         results = {}
 
         try:
-            ticker = yf.Ticker(symbol)
+            ticker = self._ticker(symbol)
 
             # Get enough history
             hist = ticker.history(period='2y')
@@ -418,37 +661,65 @@ class MarketDataProvider:
             if hist.empty:
                 return results
 
-            current_price = hist['Close'].iloc[-1]
+            current_price = hist['Close'].iat[-1]
+
+            # History comes back in date order, so each start is a binary search
+            dates = hist.index
+            closes = hist['Close'].to_numpy()
+            now = datetime.now()
+            tz = dates.tz
 
             for period in periods:
                 try:
                     if period == '1m':
-                        start_date = datetime.now() - timedelta(days=30)
+                        start_date = now - timedelta(days=30)
                     elif period == '3m':
-                        start_date = datetime.now() - timedelta(days=90)
+                        start_date = now - timedelta(days=90)
                     elif period == '6m':
-                        start_date = datetime.now() - timedelta(days=180)
+                        start_date = now - timedelta(days=180)
                     elif period == '1y':
-                        start_date = datetime.now() - timedelta(days=365)
+                        start_date = now - timedelta(days=365)
                     elif period == 'ytd':
-                        start_date = datetime(datetime.now().year, 1, 1)
+                        start_date = datetime(now.year, 1, 1)
                     else:
                         continue
 
                     # Find closest date in history
-                    mask = hist.index >= pd.Timestamp(start_date).tz_localize(hist.index.tz)
-                    if mask.any():
-                        start_price = hist.loc[mask, 'Close'].iloc[0]
+                    pos = dates.searchsorted(pd.Timestamp(start_date, tz=tz), side='left')
+                    if pos < len(closes):
+                        start_price = closes[pos]
                         results[period] = ((current_price - start_price) / start_price) * 100
-                except:
-                    pass
+                except (KeyError, IndexError, ValueError, TypeError) as e:
+                    logger.debug("No %s return for %s: %s", period, symbol, e)
 
         except Exception as e:
-            print(f"Error calculating benchmark returns for {symbol}: {e}")
+            logger.warning("Error calculating benchmark returns for %s: %s", symbol, e)
 
         return results
 
 
+# Holdings use a small, fixed set of (symbol, exchange) pairs, so memoize the conversion
+@lru_cache(maxsize=512)
+def _yahoo_symbol(symbol: str, exchange: Optional[str]) -> str:
+    symbol = symbol.upper()
+
+    # Already has exchange suffix
+    if '.' in symbol:
+        return symbol
+
+    # Add exchange suffix based on exchange parameter
+    if exchange:
+        exchange = exchange.upper()
+        if exchange == 'TSX':
+            return f"{symbol}.TO"
+        elif exchange == 'TSXV':
+            return f"{symbol}.V"
+        elif exchange in ['NYSE', 'NASDAQ', 'US']:
+            return symbol
+
+    return symbol
+
+
 # Singleton instance
 market_data = MarketDataProvider()
 
@@ -462,6 +733,18 @@ def get_crypto_price(symbol: str) -> Optional[Dict]:
     return market_data.get_crypto_price(symbol)
 
 
+def get_stock_prices_bulk(symbols: List[Tuple[str, str]]) -> Dict[str, Dict]:
+    return market_data.get_stock_prices_bulk(symbols)
+
+
+def get_stock_prices_parallel(symbols: List[Tuple[str, str]]) -> Dict[str, Dict]:
+    return market_data.get_stock_prices_parallel(symbols)
+
+
+def get_crypto_prices_parallel(symbols: List[str]) -> Dict[str, Dict]:
+    return market_data.get_crypto_prices_parallel(symbols)
+
+
 def get_gold_price() -> Optional[Dict]:
     return market_data.get_gold_price()
 
@@ -470,6 +753,15 @@ def get_fx_rate(from_currency: str, to_currency: str) -> Optional[float]:
     return market_data.get_fx_rate(from_currency, to_currency)
 
 
+def get_fx_rates_bulk(pairs: List[Tuple[str, str]]) -> Dict[Tuple[str, str], float]:
+    return market_data.get_fx_rates_bulk(pairs)
+
+
+def get_prices(stock_symbols: List[Tuple[str, str]] = (), crypto_symbols: List[str] = (),
+               fx_pairs: List[Tuple[str, str]] = (), gold: bool = False) -> Dict:
+    return market_data.get_prices(stock_symbols, crypto_symbols, fx_pairs, gold)
+
+
 def get_usd_cad_rate() -> float:
     return market_data.get_usd_cad_rate()
 
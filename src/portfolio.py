@@ -12,8 +12,7 @@ from .database import (
     get_latest_fx_rate, Investment, Transaction, Entity
 )
 from .market_data import (
-    get_stock_price, get_crypto_price, get_gold_price,
-    get_usd_cad_rate, get_fx_rate
+    get_usd_cad_rate, get_fx_rate, get_prices
 )
 from .calculations import (
     calculate_simple_return, calculate_irr, calculate_unrealized_gain,
@@ -36,20 +35,34 @@ def update_market_prices(session) -> Dict[str, any]:
     investments = get_all_investments(session, active_only=True)
     updated = 0
     errors = []
-    usd_cad = get_usd_cad_rate()
+
+    # Fetch every quote in one concurrent batch instead of one round trip per holding
+    prices = get_prices(
+        stock_symbols=list({
+            (inv.symbol, inv.exchange) for inv in investments
+            if inv.asset_class == 'Public Equities' and inv.symbol
+        }),
+        crypto_symbols=list({
+            inv.symbol for inv in investments
+            if inv.asset_class == 'Crypto' and inv.symbol
+        }),
+        fx_pairs=[('USD', 'CAD')],
+        gold=any(inv.asset_class == 'Gold' for inv in investments)
+    )
+    usd_cad = get_usd_cad_rate()  # served from the cache the batch just filled
 
     for inv in investments:
         try:
             price_data = None
 
             if inv.asset_class == 'Public Equities' and inv.symbol:
-                price_data = get_stock_price(inv.symbol, inv.exchange)
+                price_data = prices['stocks'].get((inv.symbol, inv.exchange))
 
             elif inv.asset_class == 'Crypto' and inv.symbol:
-                price_data = get_crypto_price(inv.symbol)
+                price_data = prices['crypto'].get(inv.symbol)
 
             elif inv.asset_class == 'Gold':
-                price_data = get_gold_price()
+                price_data = prices['gold']
 
             if price_data and price_data.get('price'):
                 price = price_data['price']
@@ -0,0 +1,39 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+# Make the `src` package importable the same way the Streamlit pages do
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Bound variables allowed per statement in limited_session; IN_CLAUSE_BATCH_SIZE is lowered below it
+SQL_VARIABLE_LIMIT = 20
+
+
+@pytest.fixture
+def limited_session(monkeypatch):
+    """
+    Session on a fresh in-memory database with a HoldCo entity, whose SQLite
+    connection only allows SQL_VARIABLE_LIMIT bound variables per statement,
+    like the 999-variable limit of older SQLite builds.
+    """
+    from src import database
+
+    engine = create_engine('sqlite://')
+
+    @event.listens_for(engine, 'connect')
+    def _limit_variables(dbapi_connection, connection_record):
+        dbapi_connection.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, SQL_VARIABLE_LIMIT)
+
+    database.Base.metadata.create_all(engine)
+    monkeypatch.setattr(database, 'IN_CLAUSE_BATCH_SIZE', SQL_VARIABLE_LIMIT // 2)
+
+    session = sessionmaker(bind=engine)()
+    session.add(database.Entity(name='HoldCo'))
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
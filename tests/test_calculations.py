@@ -0,0 +1,86 @@
+"""Tests for the XIRR solvers in src.calculations."""
+
+from datetime import date
+
+import numpy as np
+import pytest
+from scipy import optimize
+
+from src.calculations import (
+    _bracket_irr, _xirr_modab, _xirr_newton, calculate_irr, calculate_performance_attribution, xirr
+)
+
+
+def reference_xirr(days, amounts):
+    """XIRR by scipy's brentq on the NPV equation, as the solvers were before the kernels."""
+    years = np.asarray(days, dtype=float) / 365.0
+    amounts = np.asarray(amounts, dtype=float)
+    return optimize.brentq(lambda rate: np.sum(amounts * (1.0 + rate) ** -years), -0.9999, 10.0, xtol=1e-12)
+
+
+CASES = [
+    # One buy, one exit a year later
+    ([0, 365], [-1000.0, 1100.0]),
+    # Regular contributions and a final value
+    ([0, 90, 180, 270, 365], [-1000.0, -500.0, -500.0, -500.0, 2700.0]),
+    # Distributions along the way (private fund pattern)
+    ([0, 200, 500, 900, 1400, 1800], [-5000.0, -2500.0, 800.0, 1500.0, 2200.0, 6000.0]),
+    # Heavy loss
+    ([0, 400, 800], [-10000.0, -2000.0, 1500.0]),
+    # Very high return over a short period, where Newton from 10% overshoots
+    ([0, 90], [-100.0, 150.0]),
+    # Same-day flows mixed in
+    ([0, 0, 365, 730], [-700.0, -300.0, 50.0, 1200.0]),
+]
+
+
+@pytest.mark.parametrize('days, amounts', CASES)
+def test_xirr_matches_scipy_reference(days, amounts):
+    assert xirr(days, amounts) == pytest.approx(reference_xirr(days, amounts), abs=1e-6)
+
+
+@pytest.mark.parametrize('days, amounts', CASES)
+def test_kernels_match_scipy_reference(days, amounts):
+    days_arr = np.asarray(days, dtype=np.float64)
+    amounts_arr = np.asarray(amounts, dtype=np.float64)
+    expected = reference_xirr(days, amounts)
+
+    lo, hi = _bracket_irr(days_arr / 365.0, amounts_arr)
+    assert lo <= expected <= hi
+    assert _xirr_modab(days_arr, amounts_arr, lo, hi) == pytest.approx(expected, abs=1e-6)
+
+    newton = _xirr_newton(days_arr, amounts_arr, 0.1)
+    assert np.isnan(newton) or newton == pytest.approx(expected, abs=1e-6)
+
+
+@pytest.mark.parametrize('amounts', [[-100.0, -50.0], [100.0, 50.0], [0.0, 0.0]])
+def test_xirr_without_sign_change_is_none(amounts):
+    assert xirr([0, 365], amounts) is None
+
+
+def test_xirr_needs_two_flows():
+    assert xirr([0], [-100.0]) is None
+
+
+def test_calculate_irr_percentage():
+    flows = [(date(2023, 1, 1), -1000.0)]
+
+    irr = calculate_irr(flows, 1100.0, current_date=date(2024, 1, 1))
+
+    assert irr == pytest.approx(10.0, abs=1e-4)
+
+
+def test_performance_attribution_keeps_null_asset_class():
+    holdings = [
+        {'asset_class': None, 'weight': 50, 'return': 10},
+        {'asset_class': 'A', 'weight': 50, 'return': 4},
+        {'weight': 0, 'return': 3},
+    ]
+
+    result = calculate_performance_attribution(holdings, benchmark_return=5.0)
+
+    assert list(result['by_asset_class']) == [None, 'A', 'Other']
+    assert result['by_asset_class'][None]['contribution'] == pytest.approx(5.0)
+    assert result['by_asset_class']['Other']['holdings'] == [holdings[2]]
+    assert result['total_return'] == pytest.approx(7.0)
+    assert result['alpha'] == pytest.approx(2.0)
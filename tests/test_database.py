@@ -0,0 +1,148 @@
+"""Tests for position replay, bulk position updates and the FX rate cache in src.database."""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src import database
+from src.database import (
+    Base, Entity, FXRate, Investment, Transaction,
+    get_latest_fx_rate, update_investment_position, update_investment_position_bulk
+)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def holdings(session):
+    entity = Entity(name='HoldCo')
+    session.add(entity)
+    session.flush()
+
+    investments = [
+        Investment(name=name, asset_class='Public Equities', entity_id=entity.id, quantity=999, cost_basis=999)
+        for name in ('Apple', 'Royal Bank', 'Cash only')
+    ]
+    session.add_all(investments)
+    session.flush()
+    apple, bank, _ = investments
+
+    session.add_all([
+        Transaction(investment_id=apple.id, transaction_type='Buy', date=date(2023, 3, 1), quantity=10, total_amount=1500),
+        Transaction(investment_id=apple.id, transaction_type='Buy', date=date(2023, 1, 15), quantity=10, total_amount=1000),
+        Transaction(investment_id=apple.id, transaction_type='Sell', date=date(2023, 6, 1), quantity=5, total_amount=900),
+        Transaction(investment_id=apple.id, transaction_type='Dividend', date=date(2023, 7, 1), quantity=0, total_amount=20),
+        Transaction(investment_id=bank.id, transaction_type='Transfer In', date=date(2022, 5, 5), quantity=100, total_amount=12000),
+    ])
+    session.commit()
+    return investments
+
+
+def positions(session):
+    session.expire_all()
+    return {
+        inv.name: (inv.quantity, inv.cost_basis, inv.cost_per_unit, inv.purchase_date)
+        for inv in session.query(Investment)
+    }
+
+
+def test_bulk_update_matches_per_investment_update(session, holdings):
+    ids = [inv.id for inv in holdings]
+
+    update_investment_position_bulk(session, ids)
+    bulk = positions(session)
+
+    for inv in session.query(Investment):
+        inv.quantity = inv.cost_basis = 999
+    session.commit()
+    for investment_id in ids:
+        update_investment_position(session, investment_id)
+
+    assert bulk == positions(session)
+    assert bulk['Apple'] == (15, 1875.0, 125.0, date(2023, 1, 15))
+    assert bulk['Royal Bank'] == (100, 12000, 120.0, date(2022, 5, 5))
+    assert bulk['Cash only'] == (0, 0, 0, None)
+
+
+def test_bulk_update_ignores_unknown_ids(session, holdings):
+    apple = holdings[0]
+
+    update_investment_position_bulk(session, [apple.id, apple.id, 12345])
+
+    assert positions(session)['Apple'][:2] == (15, 1875.0)
+    assert positions(session)['Royal Bank'][:2] == (999, 999)
+
+
+def test_bulk_update_with_no_known_ids_is_a_no_op(session, holdings):
+    update_investment_position_bulk(session, [12345])
+
+    assert positions(session)['Apple'][:2] == (999, 999)
+
+
+def test_missing_fx_rate_is_not_cached(session):
+    assert get_latest_fx_rate(session, 'USD', 'CAD') == 1.0
+
+    session.add(FXRate(from_currency='USD', to_currency='CAD', date=date.today(), rate=1.37))
+    session.commit()
+
+    assert get_latest_fx_rate(session, 'USD', 'CAD') == 1.37
+
+
+def test_fx_rate_write_clears_cache(session):
+    session.add(FXRate(from_currency='USD', to_currency='CAD', date=date(2024, 1, 1), rate=1.33))
+    session.commit()
+    assert get_latest_fx_rate(session, 'USD', 'CAD') == 1.33
+
+    session.add(FXRate(from_currency='USD', to_currency='CAD', date=date(2024, 2, 1), rate=1.35))
+    session.commit()
+
+    assert get_latest_fx_rate(session, 'USD', 'CAD') == 1.35
+
+
+def test_bulk_update_batches_large_id_lists(limited_session):
+    holdco = limited_session.query(Entity).one()
+    investments = [
+        Investment(name=f"Holding {i}", asset_class='Public Equities', entity_id=holdco.id) for i in range(45)
+    ]
+    limited_session.add_all(investments)
+    limited_session.flush()
+    limited_session.add_all([
+        Transaction(investment_id=inv.id, transaction_type='Buy', date=date(2024, 1, 2),
+                    quantity=i + 1, total_amount=10 * (i + 1))
+        for i, inv in enumerate(investments)
+    ])
+    limited_session.commit()
+
+    update_investment_position_bulk(limited_session, [inv.id for inv in investments] + [99999])
+
+    limited_session.expire_all()
+    assert all(inv.quantity == i + 1 and inv.cost_per_unit == 10 for i, inv in enumerate(investments))
+
+
+def test_fx_rate_cache_is_per_database(session):
+    other_engine = create_engine('sqlite://')
+    Base.metadata.create_all(other_engine)
+    other = sessionmaker(bind=other_engine)()
+    session.add(FXRate(from_currency='USD', to_currency='CAD', date=date(2024, 1, 1), rate=1.33))
+    other.add(FXRate(from_currency='USD', to_currency='CAD', date=date(2024, 1, 1), rate=1.50))
+    session.commit()
+    other.commit()
+
+    assert get_latest_fx_rate(session, 'USD', 'CAD') == 1.33
+    assert get_latest_fx_rate(other, 'USD', 'CAD') == 1.50
+
+    other.add(FXRate(from_currency='USD', to_currency='CAD', date=date(2024, 2, 1), rate=1.55))
+    other.commit()
+
+    assert get_latest_fx_rate(other, 'USD', 'CAD') == 1.55
+    assert database._fx_rate_caches[session.get_bind()][1] == {('USD', 'CAD'): 1.33}
+    other.close()
@@ -0,0 +1,161 @@
+"""Tests for CSV reading and preview normalization in src.importers."""
+
+import pandas as pd
+import pytest
+
+from src import importers
+from src.database import Entity, Investment, Transaction
+from src.importers import CSVImporter
+
+
+def write_csv(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+@pytest.fixture
+def c_parser_only(monkeypatch):
+    """Read CSVs with the pandas C parser only."""
+    monkeypatch.setattr(importers, 'PYARROW_AVAILABLE', False)
+
+
+def test_preview_investments_blank_integer_cell(tmp_path):
+    path = write_csv(tmp_path, 'investments.csv',
+                     "name,symbol,entity,quantity,cost_basis\n"
+                     "Apple,AAPL,HoldCo,10,1000\n"
+                     "Microsoft,MSFT,HoldCo,,500\n")
+
+    df, warnings = CSVImporter().preview_investments(path)
+
+    assert list(df['name']) == ['Apple', 'Microsoft']
+    assert list(df['quantity']) == [10.0, 0.0]
+    assert list(df['cost_basis']) == [1000.0, 500.0]
+
+
+def test_preview_transactions_blank_integer_cell(tmp_path):
+    path = write_csv(tmp_path, 'transactions.csv',
+                     "investment_name,symbol,date,type,quantity,price,amount,fees\n"
+                     "Apple,AAPL,2024-01-15,Buy,10,150,1500,\n"
+                     "Apple,AAPL,2024-03-01,Dividend,,,12,0\n")
+
+    df, warnings = CSVImporter().preview_transactions(path)
+
+    assert list(df['type']) == ['Buy', 'Dividend']
+    assert list(df['quantity']) == [10.0, 0.0]
+    assert list(df['fees']) == [0.0, 0.0]
+
+
+def test_preview_investments_dirty_number_cells(tmp_path):
+    path = write_csv(tmp_path, 'investments.csv',
+                     'name,quantity,cost_basis,current_value\n'
+                     'Apple,"1,000",$1500.50,C$2000\n'
+                     'Fund,5,(250),US$100\n'
+                     'Blank,,,\n')
+
+    df, warnings = CSVImporter().preview_investments(path)
+
+    assert list(df['quantity']) == [1000.0, 5.0, 0.0]
+    assert list(df['cost_basis']) == [1500.5, -250.0, 0.0]
+    assert list(df['current_value']) == [2000.0, 100.0, 0.0]
+
+
+def test_read_file_keeps_leading_zeros(tmp_path):
+    path = write_csv(tmp_path, 'investments.csv', "name,symbol,quantity\nTencent,0700,100\n")
+
+    df, warnings = CSVImporter().preview_investments(path)
+
+    assert df['symbol'].iloc[0] == '0700'
+
+
+def test_preview_matches_c_parser(tmp_path, request):
+    path = write_csv(tmp_path, 'investments.csv',
+                     "name,symbol,asset_class,entity,currency,quantity,cost_basis,purchase_date\n"
+                     "Apple,AAPL,stock,HoldCo,USD,10,1000,2024-01-15\n"
+                     "Microsoft,MSFT,equity,Personal,,,$500,\n"
+                     "Gold Bar,,gold,HoldCo,CAD,2.5,\"4,000\",2023-06-30\n")
+
+    fast, _ = CSVImporter().preview_investments(path)
+    request.getfixturevalue('c_parser_only')
+    slow, _ = CSVImporter().preview_investments(path)
+
+    pd.testing.assert_frame_equal(fast, slow)
+
+
+def test_read_file_falls_back_on_pyarrow_error(tmp_path, monkeypatch):
+    pa = pytest.importorskip('pyarrow')
+    path = write_csv(tmp_path, 'investments.csv', "name,quantity\nApple,10\n")
+
+    def read_csv_arrow(*args, **kwargs):
+        raise pa.ArrowInvalid("CSV parse error: simulated")
+
+    monkeypatch.setattr(CSVImporter, '_read_csv_arrow', staticmethod(read_csv_arrow))
+
+    df = CSVImporter()._read_file(path, usecols=['name', 'quantity'], dtype={'name': str})
+
+    assert df['name'].tolist() == ['Apple']
+    assert df['quantity'].tolist() == [10]
+
+
+def test_preview_cache_is_bounded(tmp_path):
+    importer = CSVImporter()
+    for i in range(CSVImporter.PREVIEW_CACHE_SIZE + 3):
+        importer.preview_investments(write_csv(tmp_path, f'investments_{i}.csv', f"name,quantity\nHolding {i},{i}\n"))
+
+    assert len(importer._preview_cache) == CSVImporter.PREVIEW_CACHE_SIZE
+
+
+def test_import_investments_batches_symbol_lookups(tmp_path, limited_session):
+    holdco = limited_session.query(Entity).one()
+    limited_session.add_all([
+        Investment(name=f"Existing {i}", symbol=f"SYM{i}", asset_class='Public Equities', entity_id=holdco.id)
+        for i in range(0, 60, 2)
+    ])
+    limited_session.commit()
+    rows = "".join(f"Holding {i},SYM{i},{i}\n" for i in range(60))
+    path = write_csv(tmp_path, 'investments.csv', "name,symbol,quantity\n" + rows)
+
+    result = CSVImporter().import_investments(path, session=limited_session)
+
+    assert result['success'], result['errors']
+    assert result['imported'] == 30
+    assert limited_session.query(Investment).count() == 60
+
+
+def test_sync_investments_batches_match_lookups(tmp_path, limited_session):
+    holdco = limited_session.query(Entity).one()
+    limited_session.add_all(
+        [Investment(name=f"Holding {i}", symbol=f"SYM{i}", asset_class='Public Equities', entity_id=holdco.id)
+         for i in range(0, 30)]
+        + [Investment(name=f"Private {i}", asset_class='Private Business', entity_id=holdco.id) for i in range(30)]
+    )
+    limited_session.commit()
+    rows = "".join(f"Holding {i},SYM{i},{i}\n" for i in range(40))
+    rows += "".join(f"Private {i},,{i}\n" for i in range(30))
+    path = write_csv(tmp_path, 'investments.csv', "name,symbol,quantity\n" + rows)
+
+    result = CSVImporter().sync_investments(path, session=limited_session)
+
+    assert result['success'], result['errors']
+    assert (result['created'], result['updated']) == (10, 60)
+    assert limited_session.query(Investment).filter_by(symbol='SYM7').one().quantity == 7
+
+
+def test_import_transactions_name_match_is_first_by_id(tmp_path, limited_session):
+    holdco = limited_session.query(Entity).one()
+    first = Investment(name='Apple Inc Class B', asset_class='Public Equities', entity_id=holdco.id)
+    exact = Investment(name='Apple', asset_class='Public Equities', entity_id=holdco.id)
+    tagged = Investment(name='Apple ADR', symbol='AAPL', asset_class='Public Equities', entity_id=holdco.id)
+    limited_session.add_all([first, exact, tagged])
+    limited_session.commit()
+    path = write_csv(tmp_path, 'transactions.csv',
+                     "investment_name,symbol,date,type,quantity,price,amount\n"
+                     "apple,,2024-01-15,Buy,10,150,1500\n"
+                     "Apple,AAPL,2024-01-16,Buy,1,150,150\n")
+
+    result = CSVImporter().import_transactions(path, session=limited_session)
+
+    assert result['success'], result['errors']
+    by_date = {t.date.day: t.investment_id for t in limited_session.query(Transaction)}
+    # Like the old ILIKE '%name%' ... .first(): the exact name gets no priority over an earlier id
+    assert by_date == {15: first.id, 16: tagged.id}
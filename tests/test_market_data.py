@@ -0,0 +1,48 @@
+"""Tests for quote fan-out and caching in src.market_data (no network access)."""
+
+from types import SimpleNamespace
+
+from src.market_data import MarketDataProvider
+
+
+def test_get_prices_keeps_dual_listings_apart():
+    provider = MarketDataProvider()
+    listings = {'TSX': (25.0, 'CAD'), 'NYSE': (18.0, 'USD')}
+    provider.get_stock_price = lambda symbol, exchange: {
+        'symbol': symbol, 'price': listings[exchange][0], 'currency': listings[exchange][1]
+    }
+
+    prices = provider.get_prices(stock_symbols=[('ENB', 'TSX'), ('ENB', 'NYSE')])
+
+    assert prices['stocks'][('ENB', 'TSX')]['currency'] == 'CAD'
+    assert prices['stocks'][('ENB', 'NYSE')]['currency'] == 'USD'
+
+
+def test_stock_quote_cache_is_per_listing(monkeypatch):
+    provider = MarketDataProvider()
+    quotes = {'ENB.TO': 25.0, 'ENB': 18.0}
+    monkeypatch.setattr(provider, '_ticker', lambda yahoo_symbol: SimpleNamespace(
+        fast_info=SimpleNamespace(last_price=quotes[yahoo_symbol], previous_close=quotes[yahoo_symbol])
+    ))
+    monkeypatch.setattr(provider, '_get_stock_metadata', lambda ticker, yahoo_symbol, symbol: {
+        'name': symbol, 'currency': 'USD', 'market_cap': 0, 'pe_ratio': None, 'dividend_yield': None
+    })
+
+    assert provider.get_stock_price('ENB', 'TSX')['price'] == 25.0
+    assert provider.get_stock_price('ENB', 'NYSE')['price'] == 18.0
+
+
+def test_http_session_is_created_on_first_use(tmp_path, monkeypatch):
+    from src import market_data
+
+    cache_path = tmp_path / 'market_cache'
+    monkeypatch.setattr(market_data, 'HTTP_CACHE_PATH', str(cache_path))
+
+    provider = MarketDataProvider()
+    assert provider._http is None
+    assert not any(tmp_path.iterdir())
+
+    session = provider._get_http()
+    assert provider._get_http() is session
+    if market_data.REQUESTS_CACHE_AVAILABLE:
+        assert (tmp_path / 'market_cache.sqlite').exists()